@@ -0,0 +1,107 @@
+"""
+import time and cold start benchmark.\n
+usage: python -m benchmarks.importtime [--module cfd.app] [--top 15] [--output results.json] [--max-startup 2.0]\n
+import times are measured with python -X importtime in a fresh interpreter, cold start is the time from launching
+`python -m cfd` to its first drawn frame, read from the startup breakdown in the program log
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+STARTUP_LINE = re.compile(r"Startup time: (.*)")
+
+
+def import_times(module:str) -> list[dict]:
+    """imports module in a fresh interpreter, returns self and cumulative import time of every imported module"""
+
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=ROOT, capture_output=True, text=True, env={**os.environ, "SDL_VIDEODRIVER": "dummy"})
+    if result.returncode != 0: raise RuntimeError(f"Failed to import {module}\n{result.stderr}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match: continue
+        self_us, cumulative_us, indent, name = match.groups()
+        entries.append({"module": name, "self": int(self_us) / 1e6, "cumulative": int(cumulative_us) / 1e6, "depth": len(indent) // 2})
+    return entries
+
+def cold_start(timeout:float=120) -> dict[str, float] | None:
+    """launches the program headless in an empty directory, returns startup breakdown once the first frame is drawn"""
+
+    with tempfile.TemporaryDirectory() as cwd:
+        env = {**os.environ, "SDL_VIDEODRIVER": "dummy", "PYTHONPATH": str(ROOT)}
+        process = subprocess.Popen([sys.executable, "-m", "cfd"], cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        logpath = os.path.join(cwd, "logs", "cfd.log")
+        start = time.time()
+        breakdown = None
+        try:
+            while breakdown is None and time.time() - start < timeout and process.poll() is None:
+                time.sleep(0.05)
+                if not os.path.exists(logpath): continue
+                with open(logpath) as file:
+                    for line in file:
+                        match = STARTUP_LINE.search(line)
+                        if match:
+                            breakdown = {name: float(value[:-1]) for name, value in (part.strip().rsplit(" ", 1) for part in match.group(1).split("|"))}
+        finally:
+            process.terminate()
+            process.wait()
+    return breakdown
+
+
+def report(entries:list[dict], top:int) -> None:
+
+    total = sum(entry["self"] for entry in entries)
+    print(f"{len(entries)} modules imported in {total:.3f}s\n")
+    print(f"{'cumulative':>12} {'self':>10}  module (by cumulative time, includes nested imports)")
+    for entry in sorted(entries, key=lambda e: e["cumulative"], reverse=True)[:top]:
+        print(f"{entry['cumulative']:>11.3f}s {entry['self']:>9.3f}s  {entry['module']}")
+    print(f"\n{'self':>12}  module (any depth by self time)")
+    for entry in sorted(entries, key=lambda e: e["self"], reverse=True)[:top]:
+        print(f"{entry['self']:>11.3f}s  {entry['module']}")
+
+def main() -> int:
+
+    parser = argparse.ArgumentParser(description="Import time and cold start benchmark")
+    parser.add_argument("--module", default="cfd.app", help="module to import, defaults to everything the library screen needs")
+    parser.add_argument("--top", type=int, default=15, help="number of modules listed")
+    parser.add_argument("--output", help="write results as json to this path")
+    parser.add_argument("--no-startup", action="store_true", help="skip launching the program")
+    parser.add_argument("--max-startup", type=float, help="fail if cold start to first frame takes longer (seconds)")
+    args = parser.parse_args()
+
+    entries = import_times(args.module)
+    report(entries, args.top)
+    results = {"module": args.module, "import_total": sum(e["self"] for e in entries), "imports": entries, "startup": None}
+    heavy = [name for name in ("numba", "cfd.simulation.algorithms") if any(e["module"] == name for e in entries)]
+    if heavy: print(f"\nWarning: {', '.join(heavy)} imported eagerly")
+
+    if not args.no_startup:
+        breakdown = cold_start()
+        results["startup"] = breakdown
+        if breakdown is None:
+            print("\nProgram did not draw its first frame")
+        else:
+            print("\nCold start to first frame: " + " | ".join(f"{name} {value:.2f}s" for name, value in breakdown.items()))
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=4)
+
+    if args.max_startup is not None:
+        if results["startup"] is None or results["startup"]["total"] > args.max_startup:
+            print(f"\nCold start exceeded {args.max_startup:.2f}s")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+kernel micro-benchmarks across grid resolutions.\n
+usage: python -m benchmarks.kernels [--resolutions 32 64 ...] [--kernels step ...] [--output results.json] [--compare baseline.json]\n
+every kernel in cfd.simulation.algorithms, source application, colour mapping, resampling and a full Grid.step are timed on a wind tunnel scene.
+warm-up calls are excluded and fields are restored before every timed call, so each repeat does the same work
+"""
+import numpy as np
+
+import sys
+import json
+import logging
+import argparse
+import platform
+import subprocess
+from pathlib import Path
+from datetime import datetime
+from time import perf_counter
+from typing import Callable
+
+import numba
+
+from cfd.simulation.algorithms import *
+from cfd.simulation.derived import get_speed_field, get_vorticity_field
+from cfd.simulation.resample import resample_velocity, resample_image
+from cfd.simulation.grid import Grid
+from benchmarks.scenes import make_grid
+
+RESOLUTIONS = [32, 64, 128, 256, 512, 1024]
+FIELDS = ["u", "v", "s", "p", "div", "nu", "nv", "ns"]
+MIN_REPEATS = 3
+
+
+def kernel_cases(grid:Grid, iter:int, sor_weight:float) -> dict[str, Callable[[], None]]:
+    """one call of every kernel with the arguments the grid passes it"""
+
+    g = grid
+    residuals = np.zeros(iter)
+    img = np.zeros((g.num_cells, g.num_cells, 3), dtype=np.uint8)
+    overlay = np.zeros((int(g.dim[0]), int(g.dim[1]), 3), dtype=np.uint8)
+    frame = np.zeros((256, 256, 3), dtype=np.uint8)
+    return {
+        "apply_emitters": lambda: g.emitters.apply(g.u, g.v, g.s, g.dt * g.gravity * -9.81),
+        "ghost_cells_boundary_check": lambda: ghost_cells_boundary_check(g.u, g.v, g.s),
+        "free_slip_wall_check": lambda: free_slip_wall_check(g.num_cells, g.w, g.u, g.v),
+        "get_divergence_field": lambda: get_divergence_field(g.num_cells, g.cell_size, g.w, g.u, g.v, g.div, g._no_partials),
+        "get_divergence_field_stats": lambda: get_divergence_field(g.num_cells, g.cell_size, g.w, g.u, g.v, g.div, g.derived._partials),
+        "poisson_pressure_solve": lambda: poisson_pressure_solve(g.dt, g.num_cells, g.cell_size ** 2, g.density, g.w, g.div, iter, sor_weight),
+        "poisson_pressure_solve_residuals": lambda: poisson_pressure_solve_residuals(g.dt, g.num_cells, g.cell_size ** 2, g.density, g.w, g.div, iter, sor_weight, 1, residuals),
+        "pressure_residual": lambda: pressure_residual(g.dt, g.num_cells, g.cell_size ** 2, g.density, g.w, g.div, g.p),
+        "pressure_projection": lambda: pressure_projection(g.dt, g.num_cells, g.cell_size, g.density, g.w, g.p, g.u, g.v),
+        "semi_lagrangian_advect_velocity": lambda: semi_lagrangian_advect_velocity(g.dt, g.cell_size, g.num_cells, g.w, g.u, g.v, g.nu, g.nv),
+        "semi_lagrangian_advect_smoke": lambda: semi_lagrangian_advect_smoke(g.dt, g.cell_size, g.num_cells, g.w, g.s, g.ns, g.u, g.v, g._no_mass),
+        "semi_lagrangian_advect_smoke_mass": lambda: semi_lagrangian_advect_smoke(g.dt, g.cell_size, g.num_cells, g.w, g.s, g.ns, g.u, g.v, g.smoke_mass),
+        "smoke_diffusion": lambda: smoke_diffusion(g.dt, g.num_cells, g.w, g.s, iter, sor_weight),
+        "get_speed_field": lambda: get_speed_field(g.u, g.v, g.derived._buffer("speed")),
+        "get_vorticity_field": lambda: get_vorticity_field(g.cell_size, g.w, g.u, g.v, g.derived._buffer("vorticity")),
+        "resample_velocity": lambda: resample_velocity(g.u, g.v, g.arrow_u, g.arrow_v),
+        "resample_image": lambda: resample_image(img, frame),
+        "velocity_field_img": lambda: g.get_velocity_field_img(overlay),
+        "lic_field_img": lambda: g.get_lic_field_img(img),
+        "smoke_field_img": lambda: g.get_smoke_field_img(img),
+        "pressure_field_img": lambda: g.get_pressure_field_img(img),
+        "pressure_field_img_smoke": lambda: g.get_pressure_field_img(img, smoke_only=True),
+        "step": lambda: g.step(iter, sor_weight),
+        "step_stages": lambda: g.step_stages(iter, sor_weight),
+        "step_x10": lambda: g.step(iter, sor_weight, steps=10),
+    }
+
+def snapshot(grid:Grid) -> dict[str, np.ndarray]:
+    return {name: getattr(grid, name).copy() for name in FIELDS}
+
+def restore(grid:Grid, state:dict[str, np.ndarray]) -> None:
+    for name, arr in state.items():
+        getattr(grid, name)[...] = arr
+
+
+def time_case(case:Callable[[], None], reset:Callable[[], None], warmup:int, repeats:int, budget:float) -> np.ndarray:
+    """times repeated calls of case in seconds, stops early once budget is spent and MIN_REPEATS are done"""
+
+    for _ in range(warmup):
+        reset()
+        case()
+
+    times = []
+    start = perf_counter()
+    while len(times) < repeats:
+        reset()
+        t = perf_counter()
+        case()
+        times.append(perf_counter() - t)
+        if len(times) >= MIN_REPEATS and perf_counter() - start > budget: break
+    return np.array(times)
+
+def summarise(times:np.ndarray) -> dict[str, float]:
+    return {
+        "repeats": len(times),
+        "min": float(times.min()),
+        "median": float(np.median(times)),
+        "mean": float(times.mean()),
+        "std": float(times.std()),
+        "p95": float(np.percentile(times, 95))
+    }
+
+def run(resolutions:list[int], kernels:list[str]=None, iter:int=50, sor_weight:float=1.6, warmup:int=2, repeats:int=20, budget:float=2.0, steps:int=20) -> list[dict]:
+    """benchmarks kernels at every resolution, grid is stepped first so fields hold a developed flow"""
+
+    results = []
+    for resolution in resolutions:
+        grid = make_grid(resolution)
+        for _ in range(steps): grid.step(iter, sor_weight)
+        state = snapshot(grid)
+        cases = kernel_cases(grid, iter, sor_weight)
+
+        for name in kernels or cases:
+            times = time_case(cases[name], lambda: restore(grid, state), warmup, repeats, budget)
+            result = {"kernel": name, "resolution": resolution, **summarise(times)}
+            result["cells_per_sec"] = resolution ** 2 / result["median"]
+            results.append(result)
+            print(f"{name:<34}{resolution:>6}{1000 * result['median']:>12.3f} ms{1000 * result['std']:>10.3f} ms  (n={result['repeats']})")
+    return results
+
+def metadata() -> dict[str, str | int]:
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).parent, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "numba": numba.__version__,
+        "threads": numba.get_num_threads(),
+        "threading_layer": numba.config.THREADING_LAYER
+    }
+
+
+def compare(baseline:dict, current:dict, threshold:float) -> list[dict]:
+    """matches results by kernel and resolution, returns results whose median got slower by more than threshold"""
+
+    old = {(r["kernel"], r["resolution"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"\n{'kernel':<34}{'res':>6}{'baseline':>12}{'current':>12}{'ratio':>8}")
+    for result in current["results"]:
+        key = (result["kernel"], result["resolution"])
+        if key not in old: continue
+        ratio = result["median"] / old[key]["median"]
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append({**result, "ratio": ratio})
+            flag = "  REGRESSION"
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        print(f"{key[0]:<34}{key[1]:>6}{1000 * old[key]['median']:>9.3f} ms{1000 * result['median']:>9.3f} ms{ratio:>8.2f}{flag}")
+    return regressions
+
+def main() -> int:
+
+    parser = argparse.ArgumentParser(description="Kernel micro-benchmarks across grid resolutions")
+    parser.add_argument("--resolutions", type=int, nargs="+", default=RESOLUTIONS)
+    parser.add_argument("--kernels", nargs="+", help="only benchmark these kernels (see kernel_cases)")
+    parser.add_argument("--iter", type=int, default=50, help="Gauss-Seidel iterations of pressure solve and diffusion")
+    parser.add_argument("--sor-weight", type=float, default=1.6)
+    parser.add_argument("--warmup", type=int, default=2, help="untimed calls before timing")
+    parser.add_argument("--repeats", type=int, default=20, help="maximum timed calls per kernel")
+    parser.add_argument("--budget", type=float, default=2.0, help="seconds spent on a kernel before stopping early")
+    parser.add_argument("--output", help="write results as json to this path")
+    parser.add_argument("--compare", help="results json of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative slow down counted as regression")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    print(f"{'kernel':<34}{'res':>6}{'median':>15}{'std':>13}")
+    results = run(args.resolutions, args.kernels, args.iter, args.sor_weight, args.warmup, args.repeats, args.budget)
+    current = {"meta": metadata(), "settings": vars(args), "results": results}
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(current, file, indent=4)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regressions slower than {1 + args.threshold:.2f}x baseline")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+golden field regression test.\n
+usage: python -m benchmarks.regression [--scenes wind_tunnel ...] [--update] [--rtol 1e-6] [--max-slowdown 0.25]\n
+canned scenes are run headless for a fixed number of steps and the final u, v, s and p are compared against golden
+arrays stored in benchmarks/golden. the median step time is reported next to the time stored with the goldens, it only
+fails the check with --max-slowdown, since goldens are timed on whichever machine last regenerated them (--update)
+"""
+import numpy as np
+
+import sys
+import json
+import logging
+import argparse
+from pathlib import Path
+from time import perf_counter
+
+from cfd.simulation.grid import Grid
+from benchmarks.scenes import make_grid
+from benchmarks.kernels import metadata
+
+GOLDEN_PATH = Path(__file__).parent / "golden"
+SCENES = ["wind_tunnel", "smoke_plume", "obstacles"]
+FIELDS = ["u", "v", "s", "p"]
+
+
+def simulate(scene:str, resolution:int, steps:int, iter:int, sor_weight:float) -> tuple[Grid, np.ndarray]:
+    """runs scene for steps, returns the grid and the time of every step in seconds"""
+
+    grid = make_grid(resolution, scene)
+    times = np.empty(steps)
+    for n in range(steps):
+        t = perf_counter()
+        grid.step(iter, sor_weight)
+        times[n] = perf_counter() - t
+    return grid, times
+
+def golden_path(scene:str) -> Path:
+    return GOLDEN_PATH / f"{scene}.npz"
+
+def save_golden(scene:str, grid:Grid, times:np.ndarray, settings:dict) -> None:
+
+    GOLDEN_PATH.mkdir(exist_ok=True)
+    meta = {**settings, "step_time": float(np.median(times)), "machine": metadata()}
+    np.savez_compressed(golden_path(scene), meta=json.dumps(meta), **{name: getattr(grid, name) for name in FIELDS})
+
+def load_golden(scene:str) -> tuple[dict[str, np.ndarray], dict]:
+
+    with np.load(golden_path(scene)) as data:
+        fields = {name: data[name] for name in FIELDS}
+        meta = json.loads(str(data["meta"]))
+    return fields, meta
+
+
+def field_error(field:np.ndarray, golden:np.ndarray) -> tuple[float, float]:
+    """largest absolute difference and the scale of the golden field it is measured against"""
+
+    if field.shape != golden.shape: return np.inf, 0.0
+    return float(np.abs(field - golden).max()), float(np.abs(golden).max())
+
+def check(scene:str, atol:float, rtol:float, timing:bool, max_slowdown:float | None) -> list[str]:
+    """runs scene with the settings stored in its golden file, returns a description of every failed check"""
+
+    golden, meta = load_golden(scene)
+    grid, times = simulate(scene, meta["resolution"], meta["steps"], meta["iter"], meta["sor_weight"])
+    failures = []
+
+    for name in FIELDS:
+        error, scale = field_error(getattr(grid, name), golden[name])
+        ok = error <= atol + rtol * scale
+        print(f"  {name:<3} max error {error:.3e}  (scale {scale:.3e})  {'ok' if ok else 'FAIL'}")
+        if not ok: failures.append(f"{scene}: {name} differs from golden by {error:.3e}")
+
+    if not timing: return failures
+    step_time = float(np.median(times))
+    ratio = step_time / meta["step_time"]
+    if max_slowdown is None:
+        print(f"  step {1000 * step_time:.3f} ms, golden {1000 * meta['step_time']:.3f} ms  ({ratio:.2f}x)")
+        return failures
+    slow = ratio > 1 + max_slowdown
+    print(f"  step {1000 * step_time:.3f} ms, golden {1000 * meta['step_time']:.3f} ms  ({ratio:.2f}x)  {'SLOWER' if slow else 'ok'}")
+    if slow: failures.append(f"{scene}: step took {ratio:.2f}x golden time")
+    return failures
+
+def main() -> int:
+
+    parser = argparse.ArgumentParser(description="Compare canned scenes against golden fields and step times")
+    parser.add_argument("--scenes", nargs="+", default=SCENES)
+    parser.add_argument("--update", action="store_true", help="regenerate golden files instead of checking them")
+    parser.add_argument("--resolution", type=int, default=64, help="resolution of regenerated goldens")
+    parser.add_argument("--steps", type=int, default=100, help="steps of regenerated goldens")
+    parser.add_argument("--iter", type=int, default=50, help="Gauss-Seidel iterations of regenerated goldens")
+    parser.add_argument("--sor-weight", type=float, default=1.6, help="over-relaxation of regenerated goldens")
+    parser.add_argument("--atol", type=float, default=1e-9, help="absolute tolerance of field comparison")
+    parser.add_argument("--rtol", type=float, default=1e-6, help="tolerance relative to largest magnitude of golden field")
+    parser.add_argument("--max-slowdown", type=float, default=None, help="relative step time increase counted as regression, step times are only reported without it")
+    parser.add_argument("--no-timing", action="store_true", help="only check fields")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    simulate(args.scenes[0], args.resolution, 10, args.iter, args.sor_weight)     #   untimed, first steps run slower
+
+    if args.update:
+        settings = {"resolution": args.resolution, "steps": args.steps, "iter": args.iter, "sor_weight": args.sor_weight}
+        for scene in args.scenes:
+            grid, times = simulate(scene, args.resolution, args.steps, args.iter, args.sor_weight)
+            save_golden(scene, grid, times, settings)
+            print(f"{scene}: wrote golden/{golden_path(scene).name} ({1000 * np.median(times):.3f} ms per step)")
+        return 0
+
+    failures = []
+    for scene in args.scenes:
+        if not golden_path(scene).exists():
+            failures.append(f"{scene}: no golden file, run with --update first")
+            continue
+        print(scene)
+        failures += check(scene, args.atol, args.rtol, not args.no_timing, args.max_slowdown)
+
+    if failures:
+        print("\n" + "\n".join(failures))
+        return 1
+    print("\nAll scenes match their goldens")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
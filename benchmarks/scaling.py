@@ -0,0 +1,127 @@
+"""
+strong and weak scaling of kernels across numba thread counts.\n
+usage: python -m benchmarks.scaling [--threads 1 2 4 8] [--resolutions 128 256 512] [--weak-base 128] [--output results.json]\n
+strong scaling times every kernel on the same grid with more and more threads, speed-up is t(1) / t(n) and
+parallel efficiency is speed-up / n. weak scaling grows the grid with the thread count so every thread gets the same
+number of cells, efficiency is t(1) / t(n). both are relative to the smallest thread count given. serial kernels are
+included, they show up with an efficiency of 1 / n. set NUMBA_NUM_THREADS to test more threads than the machine has cores
+"""
+import numpy as np
+
+import sys
+import json
+import logging
+import argparse
+
+import numba
+
+from cfd.helpers.threads import max_threads
+from benchmarks.scenes import make_grid
+from benchmarks.kernels import kernel_cases, snapshot, restore, time_case, metadata
+
+
+def thread_counts() -> list[int]:
+    """powers of two up to the size of numba's thread pool, and the pool size itself"""
+
+    counts = [1]
+    while counts[-1] * 2 <= max_threads(): counts.append(counts[-1] * 2)
+    if counts[-1] != max_threads(): counts.append(max_threads())
+    return counts
+
+def weak_resolution(base:int, threads:int) -> int:
+    """resolution with threads times the cells of base, rounded to an even number"""
+
+    return 2 * round(base * np.sqrt(threads) / 2)
+
+
+def measure(resolution:int, threads:list[int], kernels:list[str], iter:int, sor_weight:float, warmup:int, repeats:int, budget:float, steps:int=20) -> dict[str, dict[int, float]]:
+    """median time of every kernel at every thread count on one grid, {kernel: {threads: seconds}}"""
+
+    grid = make_grid(resolution)
+    for _ in range(steps): grid.step(iter, sor_weight)
+    state = snapshot(grid)
+    cases = kernel_cases(grid, iter, sor_weight)
+
+    times = {name: {} for name in kernels or cases}
+    for n in threads:
+        numba.set_num_threads(n)
+        for name in times:
+            times[name][n] = float(np.median(time_case(cases[name], lambda: restore(grid, state), warmup, repeats, budget)))
+    return times
+
+def strong_scaling(resolutions:list[int], threads:list[int], kernels:list[str], **options) -> list[dict]:
+
+    results = []
+    for resolution in resolutions:
+        for name, times in measure(resolution, threads, kernels, **options).items():
+            for n, t in times.items():
+                speedup = times[threads[0]] / t
+                results.append({"kernel": name, "resolution": resolution, "threads": n, "time": t, "speedup": speedup, "efficiency": speedup * threads[0] / n})
+    return results
+
+def weak_scaling(base:int, threads:list[int], kernels:list[str], **options) -> list[dict]:
+
+    results = []
+    baseline = {}
+    for n in threads:
+        resolution = weak_resolution(base, n)
+        for name, times in measure(resolution, [n], kernels, **options).items():
+            t = times[n]
+            baseline.setdefault(name, t)
+            results.append({"kernel": name, "resolution": resolution, "threads": n, "time": t, "efficiency": baseline[name] / t})
+    return results
+
+
+def report(strong:list[dict], weak:list[dict], threads:list[int]) -> None:
+
+    header = "".join(f"{n:>16}" for n in threads)
+    for resolution in sorted({r["resolution"] for r in strong}):
+        print(f"\nStrong scaling {resolution}x{resolution}, time ms / speed-up / efficiency")
+        print(f"{'kernel':<34}{header}")
+        rows = [r for r in strong if r["resolution"] == resolution]
+        for name in dict.fromkeys(r["kernel"] for r in rows):
+            cells = {r["threads"]: r for r in rows if r["kernel"] == name}
+            print(f"{name:<34}" + "".join(f"{1000 * cells[n]['time']:>7.2f} {cells[n]['speedup']:>4.1f} {cells[n]['efficiency']:>3.0%}" for n in threads))
+
+    if weak:
+        resolutions = {r["threads"]: r["resolution"] for r in weak}
+        print(f"\nWeak scaling, time ms / efficiency (resolution {', '.join(f'{n} threads - {res}' for n, res in resolutions.items())})")
+        print(f"{'kernel':<34}{header}")
+        for name in dict.fromkeys(r["kernel"] for r in weak):
+            cells = {r["threads"]: r for r in weak if r["kernel"] == name}
+            print(f"{name:<34}" + "".join(f"{1000 * cells[n]['time']:>11.2f} {cells[n]['efficiency']:>4.0%}" for n in threads))
+
+def main() -> int:
+
+    parser = argparse.ArgumentParser(description="Strong and weak scaling of kernels across thread counts")
+    parser.add_argument("--threads", type=int, nargs="+", help="thread counts, defaults to powers of two up to NUMBA_NUM_THREADS")
+    parser.add_argument("--resolutions", type=int, nargs="+", default=[128, 256, 512], help="grid sizes of strong scaling")
+    parser.add_argument("--weak-base", type=int, default=128, help="resolution of weak scaling at one thread, 0 to skip")
+    parser.add_argument("--kernels", nargs="+", help="only benchmark these kernels (see benchmarks.kernels.kernel_cases)")
+    parser.add_argument("--iter", type=int, default=50, help="Gauss-Seidel iterations of pressure solve and diffusion")
+    parser.add_argument("--sor-weight", type=float, default=1.6)
+    parser.add_argument("--warmup", type=int, default=2, help="untimed calls before timing")
+    parser.add_argument("--repeats", type=int, default=10, help="maximum timed calls per kernel and thread count")
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds spent on a kernel before stopping early")
+    parser.add_argument("--output", help="write results as json to this path")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    threads = sorted(set(args.threads)) if args.threads else thread_counts()
+    if threads[-1] > max_threads():
+        print(f"Numba was started with {max_threads()} threads, set NUMBA_NUM_THREADS to test more")
+        return 1
+
+    options = {"iter": args.iter, "sor_weight": args.sor_weight, "warmup": args.warmup, "repeats": args.repeats, "budget": args.budget}
+    strong = strong_scaling(args.resolutions, threads, args.kernels, **options)
+    weak = weak_scaling(args.weak_base, threads, args.kernels, **options) if args.weak_base else []
+    report(strong, weak, threads)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"meta": metadata(), "settings": vars(args), "strong": strong, "weak": weak}, file, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""headless grids with canned initial conditions, shared by benchmarks"""
+import tempfile
+
+from cfd.helpers.files import Project
+from cfd.simulation.grid import Grid
+
+
+def empty(grid:Grid) -> None:
+    grid.clear_conditions()
+
+def smoke_plume(grid:Grid) -> None:
+    """closed box with a rising stream of smoke at the bottom middle"""
+
+    grid.clear_conditions()
+    n = grid.num_cells
+    mid, width = n // 2, max(n // 16, 1)
+    grid.w[1, 1:-1] = grid.w[-2, 1:-1] = grid.w[1:-1, 1] = grid.w[1:-1, -2] = 0
+    grid.v0[-5:-3, mid-width:mid+width] = grid.env_length / 2
+    grid.s0[-5:-3, mid-width:mid+width] = 1
+
+def obstacles(grid:Grid) -> None:
+    """wind tunnel with three square obstacles in the way of the smoke stream"""
+
+    grid.wind_tunnel()
+    n = grid.num_cells
+    half = max(n // 20, 1)
+    for row, col in ((n // 2, n // 4), (n // 3, n // 2), (2 * n // 3, 3 * n // 4)):
+        grid.w[row-half:row+half, col-half:col+half] = 0
+
+SCENES = {
+    "empty": empty,
+    "wind_tunnel": Grid.wind_tunnel,
+    "smoke_plume": smoke_plume,
+    "obstacles": obstacles,
+}
+
+def make_grid(resolution:int, scene:str="wind_tunnel", length:int=10, gravity:float=1, density:int=1) -> Grid:
+    """creates grid without a saved project and loads scene as its initial conditions"""
+
+    with tempfile.TemporaryDirectory() as path:
+        options = {"resolution": resolution, "length": length, "gravity": gravity, "density": density}
+        grid = Grid(Project(f"{scene}-{resolution}", path, options, {}))
+    SCENES[scene](grid)
+    grid.reset()
+    return grid
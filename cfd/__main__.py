@@ -1,3 +1,6 @@
+from time import perf_counter
+START = perf_counter()
+
 import pstats
 import cProfile
 
@@ -9,8 +12,8 @@ if __name__ == "__main__":
     log.init()
     profile = False
     if profile:
-        cProfile.run("main()", "cfd_profile.prof")
+        cProfile.run("main(START)", "cfd_profile.prof")
         stats = pstats.Stats("cfd_profile.prof")
         stats.sort_stats("cumtime").print_stats()
     else:
-        main()
\ No newline at end of file
+        main(START)
@@ -1,14 +1,19 @@
 import pygame as pg
 
 from typing import Generator
+from datetime import datetime
 import logging
 import sys
+import os
 
 from cfd.settings.manager import settings
 from cfd.helpers.files import Project
+from cfd.helpers.time import Timeline
+from cfd.helpers.profiler import FrameRecorder
 from cfd.interface.config import Events, Screens, Delay
 from cfd.interface.widgets import Widget, NULLWIDGET, TextBox
-from cfd.interface.screens import *
+from cfd.interface.screens import ToolBar, LibraryScreen, SettingsScreen, CreateProjectScreen, EditProjectScreen
+from cfd.simulation import warmup
 
 logger = logging.getLogger(__name__)
 
@@ -33,9 +38,10 @@ class DelayQueue:
 
 class App:
     
-    def __init__(self, screen: pg.Surface) -> None:
+    def __init__(self, screen: pg.Surface, startup: Timeline=None) -> None:
 
         self.running = True
+        self.startup = startup
         self.screen: pg.Surface = screen
         self.delay_queue = DelayQueue()
         
@@ -47,11 +53,14 @@ class App:
         self.max_char = -1
 
         self.clock: pg.time.Clock = pg.time.Clock()
+        self.frames = FrameRecorder()
         self.current_screen = LibraryScreen(self)
         self.tool_bar = ToolBar()
         
     def set_screen(self, screen_id) -> None:
         
+        close = getattr(self.current_screen, "close", None)
+        if close: close()
         if screen_id == Screens.LIBRARY.value:
             self.current_screen = LibraryScreen(self)
         elif screen_id == Screens.CRT_PROJ.value:
@@ -61,17 +70,29 @@ class App:
         elif screen_id == Screens.SETTINGS.value:
             self.current_screen = SettingsScreen(self)
         elif screen_id == Screens.SIMULATION.value:
+            warmup.wait()
+            from cfd.interface.screens.simulation import SimulationScreen
             self.tool_bar.highlighted = NULLWIDGET
             self.current_screen = SimulationScreen(self)
                 
+    def export_trace(self) -> None:
+        os.makedirs("logs", exist_ok=True)
+        self.frames.export_trace(os.path.join("logs", f"trace_{datetime.now():%Y%m%d-%H%M%S}.json"))
+    
     #   mainloop
     def run(self):
         
         logger.info("Running mainloop...")
 
+        frames = self.frames
         while self.running:
             self.clock.tick(settings.fps)
             fps = self.clock.get_fps()
+            frames.begin(1 / settings.fps)
+            
+            #   let the screen's stage timer report into the frame trace
+            frames.stages = getattr(self.current_screen, "timer", None)
+            if frames.stages: frames.stages.trace = frames
             
             if not self.selected.id: self.keyboard_inp = ""
             typing = False
@@ -100,16 +121,30 @@ class App:
 
                 if event.type == Events.DELAY_FUNCTION:
                     self.delay_queue.append(event.function)
+                
+                if event.type == pg.KEYDOWN and event.key == pg.K_F12:
+                    self.export_trace()
+            frames.lap("events")
                     
             self.current_screen.update()
             self.delay_queue.update()
+            frames.lap("update")
 
             self.tool_bar.update(fps)
             self.screen.fill(settings.theme.dark_bg)
             self.tool_bar.draw(self.screen)
             self.current_screen.draw(self.screen)
+            frames.lap("draw")
             pg.display.flip()
+            frames.lap("flip")
+            frames.end()
+            
+            if self.startup:
+                self.startup.mark("first frame")
+                logger.info(f"Startup time: {self.startup.report()}")
+                self.startup = None
         
+        logger.info(f"Frame times: {frames.summary()}")
         logger.info("Shutting down program...")
         pg.quit()
         sys.exit()
\ No newline at end of file
@@ -3,6 +3,7 @@ import pygame as pg
 import os
 import logging
 from pathlib import Path
+from functools import cache
 from importlib import resources
 
 logger = logging.getLogger(__name__)
@@ -10,7 +11,9 @@ logger = logging.getLogger(__name__)
 ROOT = Path(resources.files("cfd")).parent
 ASSETS_PATH = os.path.join(ROOT, "assets")
 
+@cache
 def load_image(filename: str) -> pg.Surface | None:
+    """loads image from graphics folder, every image is only read from disk once"""
     
     filepath = os.path.join(ASSETS_PATH, "graphics", filename)
     if os.path.exists(filepath):
@@ -12,7 +12,6 @@ log = logging.getLogger(__name__)
 
 
 SAVES_PATH = os.path.join(Path(__file__).parent.parent.parent, "local", "saves")
-os.makedirs(SAVES_PATH, exist_ok=True)
 
 
 #   ==========[ JSON UTIlS ]==========
@@ -199,6 +198,7 @@ def scan_projects() -> list[Project]:
     """scans all saved projects"""
     
     log.info(f"Scanning projects root /{SAVES_PATH}...")
+    os.makedirs(SAVES_PATH, exist_ok=True)
     projects: list[Project] = []
     for entry in os.scandir(SAVES_PATH):
         if not entry.is_dir(): continue     #   skip if not a folder
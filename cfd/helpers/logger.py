@@ -1,18 +1,129 @@
 import os
+import queue
+import atexit
 import logging
+import threading
+import logging.handlers
+from time import monotonic
+
+FORMAT = "%(asctime)s [%(levelname)-7s] %(name)-s: %(message)s"
+DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+#   level of every subsystem, loggers without an entry use the level of their closest parent
+LEVELS = {
+    "": "DEBUG",
+    "numba": "WARNING",
+}
+
+RATE_LIMITED = {"rate_limit": True}     #   extra= of logging calls in the frame loop, e.g. logger.debug(..., extra=RATE_LIMITED)
+
+_listener: logging.handlers.QueueListener = None
+_rate_limit: "RateLimitFilter" = None
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    limits how often a single logging call can emit, for messages logged from the frame loop.\n
+    only records logged with extra=RATE_LIMITED are limited. every such call site may emit a burst of messages, then
+    refills at rate messages per second. messages above level are never dropped, the number of dropped messages is
+    added to the next message that passes, or logged by flush(). filters run on the thread that logs, so call sites are
+    updated under a lock
+    """
+
+    def __init__(self, rate:float=5, burst:int=20, level:int=logging.INFO) -> None:
+        super().__init__()
+
+        self.rate = rate
+        self.burst = burst
+        self.level = level
+        self._sites: dict[tuple[str, int], list[float]] = {}   #   call site: [tokens, last refill, dropped]
+        self._lock = threading.Lock()
+
+    def filter(self, record:logging.LogRecord) -> bool:
+
+        if record.levelno > self.level or not getattr(record, "rate_limit", False): return True
+
+        with self._lock:
+            now = monotonic()
+            site = self._sites.setdefault((record.pathname, record.lineno), [self.burst, now, 0])
+            site[0] = min(self.burst, site[0] + (now - site[1]) * self.rate)
+            site[1] = now
+            if site[0] < 1:
+                site[2] += 1
+                return False
+
+            site[0] -= 1
+            dropped, site[2] = site[2], 0
+        if dropped:
+            record.msg = f"{record.getMessage()} ({dropped} similar messages suppressed)"
+            record.args = None
+        return True
+
+    def flush(self) -> list[tuple[str, int, int]]:
+        """path, line and number of messages dropped since the last message that passed, for every call site"""
+
+        with self._lock:
+            dropped = [(path, line, site[2]) for (path, line), site in self._sites.items() if site[2]]
+            for site in self._sites.values(): site[2] = 0
+        return dropped
+
+
+def parse_levels(text:str) -> dict[str, str]:
+    """reads levels like 'cfd.interface=INFO,cfd.simulation=DEBUG', a name without logger sets the root level"""
+
+    levels = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        name, _, level = item.rpartition("=")
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+def set_levels(levels:dict[str, str | int]) -> None:
+
+    for name, level in levels.items():
+        try:
+            logging.getLogger(name or None).setLevel(level)
+        except (ValueError, TypeError) as e:
+            logging.getLogger(__name__).warning(f"Invalid log level {level} for {name or 'root'} ({e})")
 
 #   initialise logging
-def init() -> None:
-    
+def init(levels:dict[str, str | int]=None) -> None:
+    """
+    records are handed to a background thread through a queue, so file and console output never block the caller.\n
+    levels are taken from LEVELS, then the CFD_LOG_LEVELS environment variable, then levels
+    """
+    global _listener, _rate_limit
+    if _listener is not None: return
+
     os.makedirs("logs", exist_ok=True)  #   create logs dir if not already
-    logging.basicConfig(
-        level=logging.DEBUG,    #   shows debug messages and up
-        format="%(asctime)s [%(levelname)-7s] %(name)-s: %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-        handlers=[
-            logging.FileHandler("./logs/cfd.log", "w"),   #   save in file
-            logging.StreamHandler()                             #   print out in console
-        ]
-    )
+    formatter = logging.Formatter(FORMAT, DATEFMT)
+    handlers = [
+        logging.FileHandler("./logs/cfd.log", "w"),   #   save in file
+        logging.StreamHandler()                             #   print out in console
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    records = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(records)
+    _rate_limit = RateLimitFilter()
+    queue_handler.addFilter(_rate_limit)
+    root = logging.getLogger()
+    root.addHandler(queue_handler)
+
+    set_levels({**LEVELS, **parse_levels(os.environ.get("CFD_LOG_LEVELS", "")), **(levels or {})})
+    _listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop)
+
     logger = logging.getLogger(__name__)
-    logger.info("Logging initialised")
\ No newline at end of file
+    logger.info("Logging initialised")
+
+def stop() -> None:
+    """writes out every queued record and stops the logging thread"""
+
+    global _listener
+    if _listener is None: return
+    for path, line, dropped in _rate_limit.flush():
+        logging.getLogger(__name__).info(f"{dropped} similar messages from {os.path.basename(path)}:{line} suppressed")
+    _listener.stop()
+    _listener = None
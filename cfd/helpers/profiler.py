@@ -0,0 +1,286 @@
+import numpy as np
+
+import csv
+import json
+import logging
+import tracemalloc
+from collections import deque
+from time import perf_counter
+
+from cfd.helpers.logger import RATE_LIMITED
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimer:
+    """
+    records wall time of every stage of a frame into a ring buffer holding the latest frames.\n
+    call next_frame() once per frame, start() before the first stage and lap(stage) after each stage
+    """
+
+    def __init__(self, stages:list[str], capacity:int=240) -> None:
+
+        self.stages = stages
+        self._index = {stage: i for i, stage in enumerate(stages)}
+        self.samples = np.full((capacity, len(stages)), np.nan)     #   seconds, nan if stage did not run
+        self.frame = -1
+        self._row = self.samples[0]
+        self._last = perf_counter()
+        self.allocations: AllocationTracker = None
+        self.trace: FrameRecorder = None    #   stages are also recorded as trace events when set
+
+    @property
+    def capacity(self) -> int: return len(self.samples)
+
+    def track_allocations(self, enabled:bool, every:int=10) -> None:
+        """attach or detach an allocation tracker sampling every n-th frame"""
+
+        if enabled and self.allocations is None:
+            self.allocations = AllocationTracker(self.stages, every)
+        elif not enabled and self.allocations is not None:
+            self.allocations.stop()
+            self.allocations = None
+
+    def next_frame(self) -> None:
+
+        self.frame += 1
+        self._row = self.samples[self.frame % self.capacity]
+        self._row[:] = np.nan
+        if self.allocations: self.allocations.next_frame(self.frame)
+        self._last = perf_counter()
+
+    def start(self) -> None:
+        if self.allocations: self.allocations.start()
+        self._last = perf_counter()
+
+    def lap(self, stage:str) -> None:
+        """adds time since previous lap to stage, stages running several times a frame are summed"""
+
+        now = perf_counter()
+        i = self._index[stage]
+        elapsed = now - self._last
+        self._row[i] = elapsed if self._row[i] != self._row[i] else self._row[i] + elapsed
+        if self.trace: self.trace.event(stage, self._last, now)
+        if self.allocations: self.allocations.lap(i)
+        self._last = perf_counter() if self.allocations else now
+
+    #   ==========[ STATISTICS ]==========
+    def latest(self) -> dict[str, float]:
+        """seconds spent in every stage that ran in the current frame"""
+        return {stage: t for stage, t in zip(self.stages, self._row) if t == t}
+
+    def recorded(self) -> np.ndarray:
+        """recorded frames from oldest to newest"""
+
+        if self.frame < 0: return self.samples[:0]
+        if self.frame < self.capacity: return self.samples[:self.frame + 1]
+        return np.roll(self.samples, -(self.frame % self.capacity + 1), axis=0)
+
+    def stats(self) -> dict[str, tuple[float, float]]:
+        """rolling mean and 95th percentile of every stage in milliseconds"""
+
+        samples = self.recorded()
+        stats = {}
+        for i, stage in enumerate(self.stages):
+            times = samples[:, i][~np.isnan(samples[:, i])]
+            stats[stage] = (1000 * times.mean(), 1000 * np.percentile(times, 95)) if len(times) else (np.nan, np.nan)
+        totals = np.nansum(samples, axis=1)
+        stats["total"] = (1000 * totals.mean(), 1000 * np.percentile(totals, 95)) if len(totals) else (np.nan, np.nan)
+        return stats
+
+    def export_csv(self, path:str) -> True | False:
+        """writes every recorded frame to csv, times in milliseconds"""
+
+        samples = self.recorded()
+        first = self.frame - len(samples) + 1
+        try:
+            with open(path, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(["frame", *self.stages, "total"])
+                for n, row in enumerate(samples):
+                    writer.writerow([first + n, *(f"{1000 * t:.4f}" if t == t else "" for t in row), f"{1000 * np.nansum(row):.4f}"])
+            logger.info(f"Exported stage timings of {len(samples)} frames to /{path}")
+            return True
+        except PermissionError as e:
+            logger.error(f"Cannot write to file, please enable permision to write files ({e})")
+        except Exception as e:
+            logger.error(f"An error has occured when exporting stage timings to /{path} ({e})")
+        return False
+
+
+class AllocationTracker:
+    """
+    bytes allocated by every stage of a frame, measured with tracemalloc on every n-th frame only.\n
+    a stage's allocation is the peak of memory traced on top of what was live when it started, so temporaries freed
+    within the stage are counted, including arrays allocated inside compiled kernels
+    """
+
+    def __init__(self, stages:list[str], every:int=10, capacity:int=60) -> None:
+
+        self.stages = stages
+        self.every = max(every, 1)
+        self.samples = np.full((capacity, len(stages)), np.nan)     #   bytes, nan if stage did not run
+        self.count = 0          #   sampled frames
+        self._row: np.ndarray = None
+        self._base = 0
+        self._owner = False     #   tracing started here, leave tracing started elsewhere running
+
+    def next_frame(self, frame:int) -> None:
+
+        self._row = None
+        if frame % self.every: 
+            self.stop()
+            return
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owner = True
+        self._row = self.samples[self.count % len(self.samples)]
+        self._row[:] = np.nan
+        self.count += 1
+        self.start()
+
+    def start(self) -> None:
+
+        if self._row is None: return
+        tracemalloc.reset_peak()
+        self._base = tracemalloc.get_traced_memory()[0]
+
+    def lap(self, i:int) -> None:
+
+        if self._row is None: return
+        allocated = tracemalloc.get_traced_memory()[1] - self._base
+        self._row[i] = allocated if self._row[i] != self._row[i] else self._row[i] + allocated
+        self.start()
+
+    def __del__(self) -> None:
+        self.stop()     #   screen holding the tracker was left mid sample
+
+    def stop(self) -> None:
+
+        if self._owner:
+            tracemalloc.stop()
+            self._owner = False
+
+    def stats(self) -> dict[str, float]:
+        """mean bytes allocated per sampled frame by every stage"""
+
+        samples = self.samples[:min(self.count, len(self.samples))]
+        stats = {stage: float(np.nanmean(samples[:, i])) if np.any(~np.isnan(samples[:, i])) else np.nan for i, stage in enumerate(self.stages)}
+        stats["total"] = float(np.nansum(samples, axis=1).mean()) if len(samples) else np.nan
+        return stats
+
+
+class FrameRecorder:
+    """
+    histogram of frame durations and trace of the latest frames.\n
+    call begin() at the start of a frame, lap(phase) after every phase and end() after the frame is shown. frames longer
+    than the budget are kept as hitches with their slowest phase or stage, logged at debug level, and counted in a
+    summary logged at most every summary_every seconds
+    """
+
+    def __init__(self, bin_ms:float=1, max_ms:float=100, capacity:int=20000, summary_every:float=1) -> None:
+
+        self.bin_ms = bin_ms
+        self.counts = np.zeros(int(max_ms / bin_ms) + 1, dtype=np.int64)   #   last bin counts every frame over max_ms
+        self.frame = -1
+        self.hitches: deque[tuple[int, float, str, str]] = deque(maxlen=100)     #   frame, seconds, slowest phase, slowest stage
+        self.num_hitches = 0
+        self.events: deque[tuple[str, float, float]] = deque(maxlen=capacity)       #   name, start, end
+        self.budget = 1 / 60
+        self.stages: StageTimer = None      #   stages of the current screen, used to find the slowest one
+        self._origin = perf_counter()
+        self._start = self._last = self._origin
+        self._phases: dict[str, float] = {}
+        self.summary_every = summary_every
+        self._window = (self._origin, self.frame, 0, 0.0, "")      #   start, first frame, hitches, slowest, slowest phase
+
+    def begin(self, budget:float) -> None:
+
+        self.frame += 1
+        self.budget = budget
+        self._phases = {}
+        self._start = self._last = perf_counter()
+
+    def lap(self, phase:str) -> None:
+
+        now = perf_counter()
+        self._phases[phase] = now - self._last
+        self.event(phase, self._last, now)
+        self._last = now
+
+    def event(self, name:str, start:float, end:float) -> None:
+        self.events.append((name, start, end))
+
+    def end(self) -> None:
+
+        now = perf_counter()
+        duration = now - self._start
+        self.event("frame", self._start, now)
+        self.counts[min(int(1000 * duration / self.bin_ms), len(self.counts) - 1)] += 1
+        if duration > self.budget: self._hitch(now, duration)
+        self._log_summary(now)
+
+    def _hitch(self, now:float, duration:float) -> None:
+
+        phase = max(self._phases, key=self._phases.get) if self._phases else "-"
+        stages = self.stages.latest() if self.stages else {}
+        stage = max(stages, key=stages.get) if stages else None
+        self.hitches.append((self.frame, duration, phase, stage))
+        self.num_hitches += 1
+        self.event("hitch", now, now)
+        
+        slowest = f"{phase} {1000 * self._phases.get(phase, np.nan):.1f}ms"
+        if stage: slowest += f" ({stage} {1000 * stages[stage]:.1f}ms)"
+        logger.debug(f"Frame {self.frame} took {1000 * duration:.1f}ms ({1000 * self.budget:.1f}ms budget), slowest: {slowest}", extra=RATE_LIMITED)
+
+        start, first, count, worst, worst_phase = self._window
+        self._window = (start, first, count + 1, duration, slowest) if duration > worst else (start, first, count + 1, worst, worst_phase)
+
+    def _log_summary(self, now:float) -> None:
+        """one line for every hitch within the last summary_every seconds"""
+
+        start, first, count, worst, slowest = self._window
+        if now - start < self.summary_every: return
+        if count:
+            logger.info(f"{count} of {self.frame - first} frames over budget ({1000 * self.budget:.1f}ms) in the last {now - start:.1f}s, slowest {1000 * worst:.1f}ms: {slowest}")
+        self._window = (now, self.frame, 0, 0.0, "")
+
+    #   ==========[ STATISTICS ]==========
+    def percentile(self, q:float) -> float:
+        """frame duration in milliseconds below which q percent of frames fall, resolution of one bin"""
+
+        total = self.counts.sum()
+        if not total: return np.nan
+        return self.bin_ms * (np.searchsorted(np.cumsum(self.counts), q / 100 * total) + 1)
+
+    def summary(self) -> str:
+
+        frames = int(self.counts.sum())
+        return f"{frames} frames, p50 {self.percentile(50):.0f}ms | p95 {self.percentile(95):.0f}ms | p99 {self.percentile(99):.0f}ms, {self.num_hitches} over budget"
+
+    def export_trace(self, path:str) -> True | False:
+        """writes recorded events as chrome trace json, open in chrome://tracing or ui.perfetto.dev"""
+
+        events = []
+        for name, start, end in self.events:
+            ts = 1e6 * (start - self._origin)
+            if name == "hitch":
+                events.append({"name": name, "ph": "i", "s": "g", "ts": ts, "pid": 0, "tid": 0})
+            else:
+                events.append({"name": name, "cat": "frame" if name == "frame" else "stage", "ph": "X", "ts": ts, "dur": 1e6 * (end - start), "pid": 0, "tid": 0})
+        data = {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"summary": self.summary(), "histogram_bin_ms": self.bin_ms, "histogram": self.counts.tolist()}
+        }
+        try:
+            with open(path, "w") as file:
+                json.dump(data, file)
+            logger.info(f"Exported trace of {len(events)} events to /{path}")
+            return True
+        except PermissionError as e:
+            logger.error(f"Cannot write to file, please enable permision to write files ({e})")
+        except Exception as e:
+            logger.error(f"An error has occured when exporting trace to /{path} ({e})")
+        return False
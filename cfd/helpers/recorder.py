@@ -0,0 +1,146 @@
+import numpy as np
+import pygame as pg
+
+import os
+import json
+import queue
+import atexit
+import shutil
+import logging
+import threading
+import subprocess
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ["auto", "ffmpeg", "png", "raw"]     #   auto - ffmpeg if found on PATH, otherwise png
+
+_active: set["VideoRecorder"] = set()     #   recorders whose writer has not finished, including stopped ones still draining
+_active_lock = threading.Lock()
+
+
+class VideoRecorder:
+    """
+    writes frames to a directory from a background thread, so recording never waits for the disk or the encoder.\n
+    frames are (x, y, 3) rgb arrays like pygame surfaces. pushed frames wait in a bounded queue, frames pushed while
+    the queue is full are dropped and counted. frames still queued when the program exits are written before it exits.
+    ffmpeg - pipes frames to a local ffmpeg binary (video.mp4), png - numbered images, raw - rgb24 bytes (frames.rgb)
+    with their size and rate in frames.json
+    """
+
+    def __init__(self, path:str, fmt:str="auto", fps:float=60, capacity:int=32) -> None:
+
+        if fmt == "auto": fmt = "ffmpeg" if shutil.which("ffmpeg") else "png"
+        if fmt not in FORMATS: raise ValueError(f"Unknown recording format {fmt}, expected one of {FORMATS}")
+        self.path = path
+        self.fmt = fmt
+        self.fps = fps
+        self.frames: queue.Queue[np.ndarray | None] = queue.Queue(capacity)
+        self.written = 0
+        self.skipped = 0        #   frames dropped because the queue was full, only counted by the pushing thread
+        self.lost = 0           #   frames dropped after a write failed, only counted by the writer thread
+        self.failed = False
+        self.stopped = False
+
+        self._size: tuple[int, int] = None
+        self._file = None
+        self._process: subprocess.Popen = None
+        os.makedirs(path, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="video-recorder", daemon=True)
+        self._thread.start()
+        with _active_lock: _active.add(self)
+        logger.info(f"Recording {fmt} frames to /{path}")
+
+    @property
+    def recording(self) -> bool: return self._thread.is_alive()
+
+    @property
+    def dropped(self) -> int: return self.skipped + self.lost
+
+    def push(self, frame:np.ndarray, block=False, copy=True) -> True | False:
+        """
+        queues frame for writing, returns False if it was dropped.\n
+        :param block: wait for space in the queue instead of dropping the frame
+        :param copy: queue a copy, set False if frame is not reused by the caller
+        """
+        if not block and self.frames.full():
+            self.skipped += 1
+            return False
+        try:
+            self.frames.put(np.array(frame, dtype=np.uint8) if copy else frame, block=block)
+            return True
+        except queue.Full:
+            self.skipped += 1
+            return False
+
+    def stop(self, wait=True) -> None:
+        """
+        finishes writing queued frames, waits for the writer thread unless wait is False.\n
+        a recorder stopped without waiting is still joined by stop_all when the program exits
+        """
+        if not self.stopped:
+            self.stopped = True
+            self.frames.put(None)
+        if wait: self._thread.join()
+
+    #   ==========[ WRITER THREAD ]==========
+    def _run(self) -> None:
+
+        while (frame := self.frames.get()) is not None:
+            if self.failed:
+                self.lost += 1
+                continue
+            try:
+                self._write(frame)
+                self.written += 1
+            except Exception as e:
+                logger.error(f"An error has occured when writing frame {self.written} to /{self.path} ({e})")
+                self.failed = True
+                self.lost += 1
+        self._close()
+        summary = f"Recorded {self.written} frames to /{self.path}"
+        if self.dropped: logger.warning(f"{summary}, {self.dropped} frames dropped")
+        else: logger.info(summary)
+        with _active_lock: _active.discard(self)
+
+    def _write(self, frame:np.ndarray) -> None:
+
+        if self._size is None: self._open(frame.shape[0], frame.shape[1])
+        if frame.shape[:2] != self._size: raise ValueError(f"frame size {frame.shape[:2]} differs from the first frame {self._size}")
+        match self.fmt:
+            case "png":
+                pg.image.save(pg.surfarray.make_surface(frame), os.path.join(self.path, f"frame_{self.written:06d}.png"))
+            case "raw":
+                self._file.write(np.ascontiguousarray(frame.transpose(1, 0, 2)).tobytes())     #   rows of pixels
+            case "ffmpeg":
+                self._process.stdin.write(np.ascontiguousarray(frame.transpose(1, 0, 2)).tobytes())
+
+    def _open(self, width:int, height:int) -> None:
+
+        self._size = (width, height)
+        if self.fmt == "raw":
+            with open(os.path.join(self.path, "frames.json"), "w") as file:
+                json.dump({"width": width, "height": height, "fps": self.fps, "pix_fmt": "rgb24"}, file, indent=4)
+            self._file = open(os.path.join(self.path, "frames.rgb"), "wb")
+        elif self.fmt == "ffmpeg":
+            self._process = subprocess.Popen([
+                shutil.which("ffmpeg") or "ffmpeg", "-y", "-loglevel", "error",
+                "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", f"{self.fps}", "-i", "-",
+                "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-c:v", "libx264", "-pix_fmt", "yuv420p", os.path.join(self.path, "video.mp4")
+            ], stdin=subprocess.PIPE)
+
+    def _close(self) -> None:
+
+        try:
+            if self._file: self._file.close()
+            if self._process:
+                self._process.stdin.close()
+                if self._process.wait() != 0: logger.error(f"ffmpeg exited with code {self._process.returncode}")
+        except Exception as e:
+            logger.error(f"An error has occured when closing recording /{self.path} ({e})")
+
+
+@atexit.register
+def stop_all() -> None:
+    """finishes every recording still running or draining, so videos are not cut off when the program exits"""
+    with _active_lock: recorders = list(_active)
+    for recorder in recorders: recorder.stop()
@@ -0,0 +1,50 @@
+import logging
+
+from cfd.settings.manager import settings
+
+logger = logging.getLogger(__name__)
+
+THREADING_LAYERS = ["default", "workqueue", "omp", "tbb"]
+
+
+def max_threads() -> int:
+    """size of numba's thread pool, kernels can use at most this many threads"""
+
+    from numba import config
+    return config.NUMBA_NUM_THREADS
+
+def configure() -> None:
+    """selects threading layer from settings, has to run before any parallel kernel is compiled or launched"""
+
+    from numba import config, get_num_threads
+
+    layer = settings.threading_layer if settings.threading_layer in THREADING_LAYERS else "default"
+    config.THREADING_LAYER = layer
+    try:
+        get_num_threads()       #   launches the thread pool with the selected layer
+    except ValueError as e:
+        logger.warning(f"Threading layer {layer} is not available, using default ({e})")
+        config.THREADING_LAYER = "default"
+        get_num_threads()
+    apply()
+
+def apply() -> None:
+    """sets number of threads used by parallel kernels launched from the calling thread"""
+
+    from numba import set_num_threads
+
+    num_threads = int(settings.num_threads) if settings.num_threads else max_threads()
+    num_threads = min(max(num_threads, 1), max_threads())
+    set_num_threads(num_threads)
+    logger.info(f"Parallel kernels use {num_threads}/{max_threads()} threads")
+
+def current() -> tuple[int, str]:
+    """number of threads and name of threading layer in use"""
+
+    from numba import get_num_threads, threading_layer
+
+    try:
+        layer = threading_layer()
+    except ValueError:
+        layer = "-"    #   no parallel kernel has run yet
+    return get_num_threads(), layer
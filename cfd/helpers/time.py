@@ -1,8 +1,30 @@
 from datetime import datetime
+from time import perf_counter
 
 def get_now(sec=True) -> str:
     """get current time with format"""
     
     now = datetime.now()
     ref = ":%S" if sec else ""
-    return now.strftime(f"%d-%m-%Y %H:%M{ref}")
\ No newline at end of file
+    return now.strftime(f"%d-%m-%Y %H:%M{ref}")
+
+class Timeline:
+    """records how long each named stage took since the previous checkpoint"""
+    
+    def __init__(self, start:float=None) -> None:
+        
+        self.start = self._last = start if start is not None else perf_counter()
+        self.stages: list[tuple[str, float]] = []
+    
+    def mark(self, name:str) -> float:
+        
+        now = perf_counter()
+        self.stages.append((name, now - self._last))
+        self._last = now
+        return self.stages[-1][1]
+    
+    @property
+    def total(self) -> float: return self._last - self.start
+    
+    def report(self) -> str:
+        return " | ".join(f"{name} {duration:.2f}s" for name, duration in self.stages) + f" | total {self.total:.2f}s"
@@ -45,27 +45,37 @@ class Events:
 
 
 #   ==========[ CONFIGURATIONS ]==========
-class Config:
+class FontCache(dict):
+    """creates system fonts the first time they are used, looking up system fonts is slow"""
     
-    def __init__(self, width=1980, height=1080) -> None:
-        
-        pg.font.init()
-        
-        self.width = width
-        self.height = height
+    def __init__(self, height:int) -> None:
+        super().__init__()
         
         DEJAVU = "DejaVu Sans"
         TIMES = "Times"
         ARIAL = "Arial"
-        self.font = {
-            "title" : pg.font.SysFont(DEJAVU, int(0.04 * height)),
-            "head"  : pg.font.SysFont(DEJAVU, int(0.03 * height)),
-            "body"  : pg.font.SysFont(TIMES, int(0.028 * height)),
-            "par"   : pg.font.SysFont(TIMES, int(0.024 * height)),
-            "sub"   : pg.font.SysFont(ARIAL, int(0.024 * height)),
-            "sml"   : pg.font.SysFont(ARIAL, int(0.0175 * height))
+        self.specs = {
+            "title" : (DEJAVU, int(0.04 * height)),
+            "head"  : (DEJAVU, int(0.03 * height)),
+            "body"  : (TIMES, int(0.028 * height)),
+            "par"   : (TIMES, int(0.024 * height)),
+            "sub"   : (ARIAL, int(0.024 * height)),
+            "sml"   : (ARIAL, int(0.0175 * height))
         }
+    
+    def __missing__(self, key:str) -> pg.font.Font:
         
+        if not pg.font.get_init(): pg.font.init()
+        font = self[key] = pg.font.SysFont(*self.specs[key])
+        return font
+
+class Config:
+    
+    def __init__(self, width=1980, height=1080) -> None:
+        
+        self.width = width
+        self.height = height
+        self.font = FontCache(height)
         self.update()
         
     def update(self) -> None:
@@ -3,6 +3,12 @@ from .library import LibraryScreen
 from .settings import SettingsScreen
 from .create_project import CreateProjectScreen
 from .edit_project import EditProjectScreen
-from .simulation import SimulationScreen
 
-__all__ = ["ToolBar", "LibraryScreen", "SettingsScreen", "CreateProjectScreen", "EditProjectScreen", "SimulationScreen"]
\ No newline at end of file
+__all__ = ["ToolBar", "LibraryScreen", "SettingsScreen", "CreateProjectScreen", "EditProjectScreen", "SimulationScreen"]
+
+def __getattr__(name:str):
+    #   simulation screen pulls in numba kernels, only import it once it is needed
+    if name == "SimulationScreen":
+        from .simulation import SimulationScreen
+        return SimulationScreen
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,6 +7,7 @@ from cfd.interface.config import Events, Screens, config
 from cfd.interface.widgets import Widget, NULLWIDGET, Info, RectButton, TextBox, Slidebar
 from cfd.helpers.files import create_project
 from cfd.helpers.screen import get_grid, TITLE_POS
+from cfd.helpers.logger import RATE_LIMITED
 
 logger = logging.getLogger(__name__)
 
@@ -69,7 +70,7 @@ class CreateProjectScreen:
             
         self.app.hovering = hovered
         if hovering != self.app.hovering:
-            logger.debug(f"Hovering {self.app.hovering.name}")
+            logger.debug(f"Hovering {self.app.hovering.name}", extra=RATE_LIMITED)
     
     def _handle_click(self) -> None:
         """calls function if a button is clicked"""
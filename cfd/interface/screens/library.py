@@ -8,6 +8,7 @@ from cfd.interface.config import Events, Screens, Delay, config
 from cfd.interface.widgets import NULLWIDGET, Widget, Info, RectButton, ProjectButton
 from cfd.helpers.files import scan_projects, delete_project, edit_project
 from cfd.helpers.screen import get_grid, TITLE_POS
+from cfd.helpers.logger import RATE_LIMITED
 
 logger = logging.getLogger(__name__)
 
@@ -59,7 +60,7 @@ class LibraryScreen:
             
         self.app.hovering = hovered        
         if hovering != self.app.hovering:
-            logger.debug(f"Hovering {self.app.hovering.name}")
+            logger.debug(f"Hovering {self.app.hovering.name}", extra=RATE_LIMITED)
     
     def _handle_click(self) -> str | None:
         """calls function if a button is clicked"""
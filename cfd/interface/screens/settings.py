@@ -7,6 +7,8 @@ from cfd.settings.manager import settings
 from cfd.interface.config import config
 from cfd.interface.widgets import Widget, Info, NULLWIDGET, Dropdown, CheckBox, Slidebar
 from cfd.helpers.screen import get_grid, TITLE_POS, LARGE_WIDGET, SB_DIM
+from cfd.helpers import threads
+from cfd.helpers.logger import RATE_LIMITED
 
 logger = logging.getLogger(__name__)
 
@@ -38,11 +40,25 @@ class SettingsScreen:
         self.sor_weight_info = Info(name="sor_weight_info", title="Successive Over-relaxation Weight", pos=get_grid(16, 12), description="Artificial multiplier applied on pressure values after every calculation. Pressure values with same degree of accuracy can be calculated with less Gauss-Seidel iterations, but incorrect pressure values may be calculated. Any value higher than 1.8 is not recommended.")
         self.sor_weight_sb = Slidebar(name="sor_weight_sb", rect=pg.Rect(get_grid(21, 14), SB_DIM), min_val=1, max_val=1.9, step=0.05, default=settings.sor_weight)
 
+        #   ==========[ NUMBA THREADS ]==========
+        max_threads = threads.max_threads()
+        self.threads_info = Info(name="threads_info", title="Solver Threads", pos=get_grid(16, 17), description="Number of CPU threads used by the simulation. Lower this when running several simulations side by side on the same computer.")
+        self.threads_sb = Slidebar(name="threads_sb", rect=pg.Rect(get_grid(21, 19), SB_DIM), min_val=1, max_val=max_threads, step=1, default=min(int(settings.num_threads), max_threads) if settings.num_threads else max_threads)
+        
+        #   ==========[ THREADING LAYER ]==========
+        self.layer_info = Info(name="layer_info", title="Threading Layer", pos=get_grid(3, 21), description="Library that runs the simulation threads (workqueue, OpenMP or TBB). Takes effect after restarting the program.")
+        self.layer_drp = Dropdown(name="layer_drp", rect=pg.Rect(get_grid(3, 22), LARGE_WIDGET), options=threads.THREADING_LAYERS, setting=settings.threading_layer)
+
+        #   ==========[ RENDER SCHEDULE ]==========
+        self.steps_info = Info(name="steps_info", title="Steps Per Frame", pos=get_grid(16, 21), description="Simulation steps run before every displayed frame. Speeds up the simulation without raising the refresh rate. High performance load.")
+        self.steps_sb = Slidebar(name="steps_sb", rect=pg.Rect(get_grid(21, 23), SB_DIM), min_val=1, max_val=8, step=1, default=settings.steps_per_frame)
+        self.render_info = Info(name="render_info", title="Render Every", pos=get_grid(16, 25), description="Number of frames between redrawing the displayed field. Leaves more time for the solver at high refresh rates and resolutions.")
+        self.render_sb = Slidebar(name="render_sb", rect=pg.Rect(get_grid(21, 27), SB_DIM), min_val=1, max_val=8, step=1, default=settings.render_every)
 
-        self.dropdowns:list[Dropdown] = [self.theme_drp, self.fps_drp]
-        self.infos: list[Info] = [self.theme_info, self.fps_info, self.iter_info, self.sor_weight_info]
+        self.dropdowns:list[Dropdown] = [self.theme_drp, self.fps_drp, self.layer_drp]
+        self.infos: list[Info] = [self.theme_info, self.fps_info, self.iter_info, self.sor_weight_info, self.threads_info, self.layer_info, self.steps_info, self.render_info]
         self.checkboxes: list[CheckBox] = [self.shw_fps_chk]
-        self.slidebars: list[Slidebar] = [self.iter_sb, self.sor_weight_sb]
+        self.slidebars: list[Slidebar] = [self.iter_sb, self.sor_weight_sb, self.threads_sb, self.steps_sb, self.render_sb]
 
     
     def _widgets(self) -> chain[Widget]:
@@ -67,7 +83,7 @@ class SettingsScreen:
 
         self.app.hovering = hovered
         if hovering != self.app.hovering:
-            logger.debug(f"Hovering {self.app.hovering.name}")
+            logger.debug(f"Hovering {self.app.hovering.name}", extra=RATE_LIMITED)
 
     def _handle_click(self) -> None:
         """calls function if a dropdown menu is clicked"""
@@ -97,6 +113,10 @@ class SettingsScreen:
                 settings.fps = int(self.fps_drp.hovering.text)
                 self.fps_drp.clicked(settings.fps)
             
+            elif self.layer_drp.hovering.name:
+                settings.threading_layer = self.layer_drp.hovering.text.lower()
+                self.layer_drp.clicked(settings.threading_layer)
+            
             settings.save()
             config.update()
             
@@ -129,6 +149,13 @@ class SettingsScreen:
                             settings.iterator = sb.value
                         case self.sor_weight_sb.id:
                             settings.sor_weight = sb.value
+                        case self.threads_sb.id:
+                            settings.num_threads = int(sb.value)
+                            threads.apply()
+                        case self.steps_sb.id:
+                            settings.steps_per_frame = int(sb.value)
+                        case self.render_sb.id:
+                            settings.render_every = int(sb.value)
                     settings.save()
                     break
             
@@ -1,22 +1,34 @@
 import pygame as pg
 import numpy as np
 
+import os
 import logging
+from datetime import datetime
 from itertools import chain
 
 from cfd.settings.manager import settings
 from cfd.interface.config import config
 from cfd.interface.widgets import Widget, NULLWIDGET, Info, Dropdown, Slidebar, CheckBox, RectButton
 from cfd.helpers.screen import TITLE_POS, get_grid
+from cfd.helpers import threads
+from cfd.helpers.profiler import StageTimer
+from cfd.helpers.recorder import VideoRecorder
+from cfd.helpers.logger import RATE_LIMITED
 from cfd.simulation.grid import Grid
+from cfd.simulation.resample import resample_image
 
 logger = logging.getLogger(__name__)
 
+STAGES = ["forces", "boundary", "advection", "divergence", "pressure", "projection", "image", "blit", "step"]    #   step - fused simulation step, runs instead of separate stages while debug screen is hidden
+RESIDUAL_EVERY = 2      #   sweeps between recorded pressure residuals
+RECORD_SIZE = 512       #   side of recorded frames in pixels, the field is resampled to it whatever the resolution
+
 class SimulationScreen:
     
     def __init__(self, app) -> None:
         from cfd.app import App
         self.app: App = app
+        if hasattr(self, "recorder"): self.close()      #   screen is re-initialised after configuring
         
         self.title_surf = config.font["title"].render("Simulation", True, config.main_clr)
         self.control_surf = config.font["sub"].render("Add velocity - LMB drag    Add smoke - RMB drag", True, config.hvr_clr)
@@ -30,20 +42,28 @@ class SimulationScreen:
         
         self.dsp_field = "Smoke"
         self.dsp_field_info = Info(name="dsp-field-info", title="Display Field", pos=get_grid(2, 7), description="Select type of field to display.")
-        self.dsp_field_drp = Dropdown(name="dsp-field-drp", rect=pg.Rect(get_grid(8, 7), drp_dim), options=["Smoke", "Divergence", "Pressure"], setting=self.dsp_field, anchor="w", font=config.font["par"])
+        self.dsp_field_drp = Dropdown(name="dsp-field-drp", rect=pg.Rect(get_grid(8, 7), drp_dim), options=["Smoke", "Divergence", "Pressure", "LIC"], setting=self.dsp_field, anchor="w", font=config.font["par"])
         self.shw_vel_chk = CheckBox(name="shw-vel-chk", pos=get_grid(2, 8.5), text="Show velocity arrows")
         self.smoke_only_chk = CheckBox(name="smoke-only-chk", pos=get_grid(8, 8.5), text="Smoke only")
+        self.lic_half_chk = CheckBox(name="lic-half-chk", pos=get_grid(8, 8.5), text="Half resolution")
+        self.lic_slow_chk = CheckBox(name="lic-slow-chk", pos=get_grid(8, 9.25), text="Every 4th frame")
+        self.field_chks: dict[str, list[CheckBox]] = {"Pressure": [self.smoke_only_chk], "LIC": [self.lic_half_chk, self.lic_slow_chk]}     #   options of displayed field
         
         self.brush_info = Info(name="brush_size_info", title="Brush Size", pos=get_grid(2, 10))
         self.brush_sb = Slidebar(name="brush_size_sb", rect=pg.Rect(get_grid(9, 10), sb_dim), min_val=1, max_val=int(0.25 * self.grid.num_cells), step=1, default=int(0.1 * self.grid.num_cells))
         
         self.shw_debug_chk = CheckBox(name="shw-debug-chk", pos=get_grid(2, 11.5), text="Show debug screen")
+        self.record_chk = CheckBox(name="record-chk", pos=get_grid(8, 11.5), text="Record")
+        self.record_info = Info(name="record_info", title="Recorded: 0 | Dropped: 0", pos=get_grid(8, 12.25), description="Frames written to the recordings folder and frames dropped because the writer fell behind. Recording stops when unchecked or when leaving the simulation.", font=config.font["sml"], desc_font=config.font["sml"])
+        self.recorder: VideoRecorder = None
+        self.record_frame: np.ndarray = None
         
         self.config_env = RectButton(name="config-env-btn", rect=pg.Rect(get_grid(2, 24), (int(0.18 * config.width), int(0.05 * config.height))), text="Configure Environment")
         
         #   ==========[ DEBUG SCREEN ]==========
         self.total_div = Info(name="total_div_info", title="Total Divergence: 0", pos=get_grid(2, 14), description="Sum of magnitude of divergence of all cells, simulation will be less accurate if this number is huge. Divergence of a cell is how much velocity field diverge or converge around it", font=config.font["sub"], desc_font=config.font["sml"])
         self.total_s = Info(name="total_s_info", title="Total Smoke Density: 0", pos=get_grid(2, 14.75), description="Sum of smoke density of all cells.", font=config.font["sub"], desc_font=config.font["sml"])
+        self.total_ke = Info(name="total_ke_info", title="Kinetic Energy: 0 | Max Speed: 0", pos=get_grid(2, 15.375), description="Kinetic energy of the fluid per meter of depth in joules and speed of the fastest cell in meter per second.", font=config.font["sml"], desc_font=config.font["sml"])
         
         self.cell_type = Info(name="cell_type_info", title="Cell Type: -", pos=get_grid(2, 16), description="Cell type of hovering cell, fluid cell - 1; wall cell - 0.", font=config.font["sub"], desc_font=config.font["sml"])
         self.cell_idx = Info(name="cell_idx_info", title="Cell Index: (-, -)", pos=get_grid(2, 16.75), description="Grid index of hovering cell in (row, column), starts with top-left corner with index (0, 0).", font=config.font["sub"], desc_font=config.font["sml"])
@@ -52,8 +72,23 @@ class SimulationScreen:
         self.cell_s = Info(name="cell_s_info", title="Smoke Density: -", pos=get_grid(2, 19), description="Smoke density of hovering cell from 0 to 1.", font=config.font["sub"], desc_font=config.font["sml"])
         self.cell_p = Info(name="cell_p_into", title="Pressure: -", pos=get_grid(2, 19.75), description="Relative pressure of hovering cell, high - positive; normal - zero; low - negative.", font=config.font["sub"], desc_font=config.font["sml"])
         
-        self.proj_field_chk = CheckBox(name="proj-field-chk", pos=get_grid(2, 20.5), text="Enable projection step (clears out divergence)", font=config.font["sub"], checked=True)
-        self.adv_field_chk = CheckBox(name="adv-field-chk", pos=get_grid(2, 21.25), text="Enable advection step (transport velocities and smoke)", font=config.font["sub"], checked=True)
+        self.proj_field_chk = CheckBox(name="proj-field-chk", pos=get_grid(2, 20.5), text="Projection (clears divergence)", font=config.font["sub"], checked=True)
+        self.adv_field_chk = CheckBox(name="adv-field-chk", pos=get_grid(2, 21.25), text="Advection (moves fluid and smoke)", font=config.font["sub"], checked=True)
+        self.threads_info = Info(name="threads_debug_info", title="Threads: -", pos=get_grid(2, 22.25), description="Number of threads used by parallel kernels and the threading layer running them, can be changed in settings.", font=config.font["sub"], desc_font=config.font["sml"])
+        self.alloc_chk = CheckBox(name="alloc-chk", pos=get_grid(2, 23), text="Track allocations (slow)", font=config.font["sub"])
+        
+        #   ==========[ STAGE TIMINGS ]==========
+        self.timer = StageTimer(STAGES)
+        self.timings_info = Info(name="timings_info", title="Stage Time (mean / p95)", pos=get_grid(7.5, 14), description="Wall time of every simulation and rendering stage in milliseconds, averaged over the latest frames. p95 - 95% of frames were faster than this. With allocation tracking, memory allocated by the stage is sampled every 10th frame and shown after. While this screen is shown the step runs one kernel at a time so its stages can be timed, which is slower than the single compiled step used when it is hidden (exported as step).", font=config.font["sub"], desc_font=config.font["sml"])
+        self.stage_infos: dict[str, Info] = {}
+        for i, stage in enumerate(STAGES[:-1] + ["total"]):
+            self.stage_infos[stage] = Info(name=f"{stage}_time_info", title=f"{stage.capitalize()}: -", pos=get_grid(7.5, 14.75 + 0.6 * i), font=config.font["sml"])
+        self.export_btn = RectButton(name="export-timings-btn", rect=pg.Rect(get_grid(7.5, 20.25), (int(0.1 * config.width), int(0.03 * config.height))), text="Export CSV", font=config.font["sml"])
+        
+        #   ==========[ SOLVER TELEMETRY ]==========
+        self.residual_chk = CheckBox(name="residual-chk", pos=get_grid(7.5, 21.75), text="Record solver residuals", font=config.font["sml"])
+        self.residual_info = Info(name="residual_info", title="Residual: - | Divergence: -", pos=get_grid(7.5, 22.4), description="Root mean square error of pressure solve after the last iteration and divergence left after the step, both in s^-1. Line shows the error (log scale) after every iteration, a flat tail means iterations are wasted.", font=config.font["sml"], desc_font=config.font["sml"])
+        self.residual_rect = pg.Rect(get_grid(7.5, 23.1), (int(0.14 * config.width), int(0.05 * config.height)))
         
         #   ==========[ CONFIGURE ENVIRONMENT SCREEN ]==========
         self.clr_init_btn = RectButton(name="clr-init-btn", rect=pg.Rect(get_grid(2, 7), (int(0.15 * config.width), int(0.05 * config.height))), text="Clear Configurations")
@@ -72,11 +107,12 @@ class SimulationScreen:
         self.infos: list[Info] = [self.dsp_field_info, self.brush_info]
         self.drps: list[Dropdown] = [self.dsp_field_drp]
         self.sbs: list[Slidebar] = [self.brush_sb]
-        self.chks: list[CheckBox] = [self.shw_debug_chk, self.shw_vel_chk, self.smoke_only_chk]
+        self.chks: list[CheckBox] = [self.shw_debug_chk, self.shw_vel_chk, self.record_chk]
         self.btns: list[RectButton] = [self.config_env]
         
-        self.debug_infos: list[Info] = [self.total_div, self.total_s, self.cell_type, self.cell_idx, self.cell_vel, self.cell_div, self.cell_s, self.cell_p]
-        self.debug_chks: list[CheckBox] = [self.proj_field_chk, self.adv_field_chk]
+        self.debug_infos: list[Info] = [self.total_div, self.total_s, self.total_ke, self.cell_type, self.cell_idx, self.cell_vel, self.cell_div, self.cell_s, self.cell_p, self.threads_info, self.timings_info, *self.stage_infos.values(), self.residual_info]
+        self.debug_chks: list[CheckBox] = [self.proj_field_chk, self.adv_field_chk, self.residual_chk, self.alloc_chk]
+        self.debug_btns: list[RectButton] = [self.export_btn]
         
         self.config_infos: list[Info] = [self.brush_info, self.angle_info, self.vel_mag_info]
         self.config_sbs: list[Slidebar] = [self.brush_sb, self.vel_mag_sb]
@@ -85,22 +121,46 @@ class SimulationScreen:
         self.hover_idx: tuple[int, int] = None
         self.configuring = False
         
-        self.base_img = np.zeros([self.grid.num_cells, self.grid.num_cells, 3], dtype=np.uint8)
-        self.vel_img = np.zeros((self.grid.dim[1], self.grid.dim[0], 3), dtype=np.uint8)
-        self.img_surf = pg.surfarray.make_surface(self.vel_img)
+        #   fields are drawn straight into persistent surfaces through pixel views, views are released before blitting
+        self.base_surf = pg.Surface((self.grid.num_cells, self.grid.num_cells))
+        self.img_surf = pg.Surface(self.grid.dim)       #   base surface scaled to grid size, only rescaled when base changes
+        self.vel_surf = pg.Surface(self.grid.dim)
+        self.vel_surf.set_colorkey((0, 0, 0))
+        self.scaled = False
+        self.shown: tuple = None        #   what the images were last drawn with, redrawn at once when it changes
         
     def _widgets(self) -> chain[Widget]:
-        widgets = chain(self.drps, self.infos, self.sbs, self.chks, self.btns)
+        widgets = chain(self.drps, self.infos, self.sbs, self.chks, self.field_chks.get(self.dsp_field, []), self.btns)
         if self.configuring: return chain(self.config_infos, self.config_sbs, self.config_btns)
-        if self.shw_debug_chk.checked: return chain(widgets, self.debug_infos, self.debug_chks)
+        if self.recorder: widgets = chain(widgets, [self.record_info])
+        if self.shw_debug_chk.checked: return chain(widgets, self.debug_infos, self.debug_chks, self.debug_btns)
         return widgets
     
     def reset_config(self) -> None:
+        self.grid.clear_conditions()
+    
+    def close(self) -> None:
+        """called before leaving the screen"""
+        self.stop_recording()
+    
+    #   ==========[ RECORDING ]==========
+    def start_recording(self) -> None:
+        """
+        frames are recorded at the rate images are regenerated, one every render_every * steps_per_frame steps, so
+        recordings play back at the speed of simulated time.\n
+        frames are the displayed field and arrows redrawn at RECORD_SIZE pixels, not a copy of the screen
+        """
+        
+        path = os.path.join("recordings", f"{self.app.project.name}_{datetime.now():%Y%m%d-%H%M%S}")
+        self.record_frame = np.zeros((RECORD_SIZE, RECORD_SIZE, 3), dtype=np.uint8)
+        self.recorder = VideoRecorder(path, fps=settings.fps / (settings.render_every * settings.steps_per_frame))
+    
+    def stop_recording(self) -> None:
         
-        self.grid.u0[:, :] = 0
-        self.grid.v0[:, :] = 0
-        self.grid.s0[:, :] = 0
-        self.grid.w[:, :] = 1
+        if self.recorder is None: return
+        self.recorder.stop(wait=False)
+        self.recorder = None
+        self.record_chk.checked = False
         
     #   ==========[ EVENT HANDLING ]==========
     def _handle_hover(self, mouse_pos: tuple) -> None:        
@@ -120,7 +180,7 @@ class SimulationScreen:
             
         self.app.hovering = hovered
         if hovering != self.app.hovering:
-            logger.debug(f"Hovering {self.app.hovering.name}")
+            logger.debug(f"Hovering {self.app.hovering.name}", extra=RATE_LIMITED)
     
     def _handle_click(self) -> None:        
         
@@ -155,13 +215,18 @@ class SimulationScreen:
         elif self.app.hovering.id == self.clr_init_btn.id:
             self.reset_config()
         
+        elif self.app.hovering.id == self.export_btn.id:
+            os.makedirs("logs", exist_ok=True)
+            self.timer.export_csv(os.path.join("logs", f"timings_{datetime.now():%Y%m%d-%H%M%S}.csv"))
+        
         elif self.app.hovering.id == self.wind_btn.id:
-            self.reset_config()
-            mid = self.grid.num_cells // 2
-            length = self.grid.num_cells // 30
-            self.grid.w[1, :] = self.grid.w[-2, :] = 0
-            self.grid.u0[:, 1:4] = self.grid.env_length * 2
-            self.grid.s0[mid-length:mid+length, 1:4] = 1
+            self.grid.wind_tunnel()
+        
+        elif self.app.hovering.id == self.record_chk.id:
+            if self.recorder: self.stop_recording()
+            else:
+                self.record_chk.checked = True
+                self.start_recording()
             
         else:
             for widget in self._widgets():
@@ -232,8 +297,8 @@ class SimulationScreen:
                     self.grid.v0[brush_area] = self.vel_mag_sb.value * np.sin(rad) * np.ones_like(weight)
                 
                 if right:
-                    self.grid.s0[brush_area] += np.clip((weight * radius * 2), 0, 1).astype(np.uint8)
-                    np.clip(self.grid.s0, 0, 1, out=self.grid.s0)
+                    self.grid.s0[brush_area] = np.clip(self.grid.s0[brush_area] + np.clip((weight * radius * 2), 0, 1).astype(np.uint8), 0, 1)
+        self.grid.derived.invalidate()
             
         
     def handle_events(self, event: pg.event.Event) -> None:
@@ -268,14 +333,15 @@ class SimulationScreen:
     def _update_text(self) -> None:
         
         if self.shw_debug_chk.checked:
-            self.total_div.title = f"Total Divergence: {np.sum(np.abs(self.grid.div)):.4f}"
-            self.total_s.title = f"Total Smoke Density: {np.sum(self.grid.s):.4f}"
+            self.total_div.title = f"Total Divergence: {self.grid.derived.total_divergence:.4f}"
+            self.total_s.title = f"Total Smoke Density: {self.grid.derived.total_smoke:.4f}"
+            self.total_ke.title = f"Kinetic Energy: {self.grid.derived.kinetic_energy:.1f} | Max Speed: {self.grid.derived.max_speed:.2f}"
             
             if self.hover_idx is not None:
                 type_text = self.grid.w[self.hover_idx]
                 idx_text = self.hover_idx
                 vel_text = f"({self.grid.u[self.hover_idx]:.4f}, {self.grid.v[self.hover_idx]:.4f})"
-                div_text = f"{self.grid.div[self.hover_idx]:.4f}"
+                div_text = f"{self.grid.derived.divergence[self.hover_idx]:.4f}"
                 s_text = f"{self.grid.s[self.hover_idx]:.4f}"
                 p_text = f"{self.grid.p[self.hover_idx]:.4f}"
             else:
@@ -289,6 +355,21 @@ class SimulationScreen:
             self.cell_s.title = f"Smoke Density: {s_text}"
             self.cell_p.title = f"Pressure: {p_text}"
             
+            num_threads, layer = threads.current()
+            self.threads_info.title = f"Threads: {num_threads} ({layer})"
+            
+            if self.timer.frame % 10 == 0:
+                allocations = self.timer.allocations.stats() if self.timer.allocations else {}
+                for stage, (mean, p95) in self.timer.stats().items():
+                    if stage not in self.stage_infos: continue
+                    allocated = f", {allocations[stage] / 1024:.1f} KiB" if stage in allocations and allocations[stage] == allocations[stage] else ""
+                    self.stage_infos[stage].title = f"{stage.capitalize()}: {mean:.2f} / {p95:.2f} ms{allocated}"
+            
+            if self.grid.residual_every:
+                self.residual_info.title = f"Residual: {self.grid.residual:.2e} | Divergence: {self.grid.divergence_norm:.2e}"
+            
+        if self.recorder:
+            self.record_info.title = f"Recorded: {self.recorder.written} | Dropped: {self.recorder.dropped}"
         if self.configuring:
             self.angle_info.title = f"Velocity Direction: {self.angle} deg"
         
@@ -301,61 +382,78 @@ class SimulationScreen:
         
     def _update_screen(self) -> None:
         
-        self._update_text()
+        self.timer.start()
+        base_img = pg.surfarray.pixels3d(self.base_surf)
         match self.dsp_field:
-            case "Smoke": self.grid.get_smoke_field_img(self.base_img)
-            case "Divergence": self.grid.get_divergence_field_img(self.base_img)
-            case "Pressure": self.grid.get_pressure_field_img(self.base_img, smoke_only=self.smoke_only_chk.checked)
-            case "Config": self.grid.get_smoke_field_img(self.base_img, initial=True)
-        self.vel_img[:, :, :] = 0
-        
-        if self.configuring:
-            self.grid.get_velocity_field_img(self.vel_img, initial=True)
-        elif self.shw_vel_chk.checked:
-            self.grid.get_velocity_field_img(self.vel_img)
+            case "Smoke": self.grid.get_smoke_field_img(base_img)
+            case "Divergence": self.grid.get_divergence_field_img(base_img)
+            case "Pressure": self.grid.get_pressure_field_img(base_img, smoke_only=self.smoke_only_chk.checked)
+            case "LIC": self.grid.get_lic_field_img(base_img, stride=2 if self.lic_half_chk.checked else 1, every=4 if self.lic_slow_chk.checked else 1)
+            case "Config": self.grid.get_smoke_field_img(base_img, initial=True)
+        self.grid.get_walls_field_img(base_img)
+        if self.recorder: resample_image(base_img, self.record_frame)
+        del base_img
+        self.scaled = False
+        
+        if self.configuring or self.shw_vel_chk.checked:
+            self.vel_surf.fill((0, 0, 0))
+            vel_img = pg.surfarray.pixels3d(self.vel_surf)
+            self.grid.get_velocity_field_img(vel_img, initial=self.configuring)
+            del vel_img
+            if self.recorder: self.grid.get_velocity_field_img(self.record_frame, initial=self.configuring, cell_px=RECORD_SIZE / self.grid.num_cells)
+        if self.recorder: self.recorder.push(self.record_frame)
+        self.timer.lap("image")
 
 
     def _update_grid(self) -> None:
         
+        timer = self.timer
+        timer.track_allocations(self.shw_debug_chk.checked and self.alloc_chk.checked)
+        timer.next_frame()
+        self.grid.residual_every = RESIDUAL_EVERY if self.shw_debug_chk.checked and self.residual_chk.checked else 0
+        self.grid.diagnostics = self.shw_debug_chk.checked
         if not self.configuring:
-            project = self.proj_field_chk.checked
-            advect = self.adv_field_chk.checked
-            iter = settings.iterator
-            sor = settings.sor_weight
-                    
-            #   1. add external sources
-            self.grid.add_external_forces()            
-            self.grid.set_boundary_values()
-            
-            #   2. move smoke and velocity around
-            if advect:
-                self.grid.advect_smoke()
-                self.grid.advect_velocities()
-                np.clip(self.grid.s, 0, 1, out=self.grid.s)
-            
-            #   3. clears out divergence to enforce incompressibility
-            self.grid.calculate_divergence()
-            self.grid.calculate_pressure(iter, sor)
-            if project: self.grid.project_velocities()
-
-            self.grid.set_boundary_values()
-        
-        #   4. update screen  
-        self.grid.calculate_divergence()
-        self._update_screen()
+            #   time every stage while debug screen is shown, otherwise run the whole step as one compiled call
+            debug = self.shw_debug_chk.checked
+            self.grid.step(settings.iterator, settings.sor_weight, project=self.proj_field_chk.checked, advect=self.adv_field_chk.checked, timer=timer if debug else None, steps=settings.steps_per_frame)
+            if not debug: timer.lap("step")
+        
+        #   update screen, images are regenerated every few frames unless what is shown changed
+        shown = (self.dsp_field, self.smoke_only_chk.checked, self.lic_half_chk.checked, self.lic_slow_chk.checked, self.shw_vel_chk.checked, self.configuring)
+        render = self.configuring or shown != self.shown or timer.frame % settings.render_every == 0
+        self._update_text()
+        if render:
+            self.shown = shown
+            self._update_screen()
 
     
     #   ==========[ DRAW ]==========
-    def draw_grid(self, screen:pg.Surface) -> None:        
-        self.grid.get_walls_field_img(self.base_img)
-        base_surf = pg.surfarray.make_surface(self.base_img)
-        self.img_surf.blit(pg.transform.scale(base_surf, self.grid.dim), (0, 0))
+    def draw_grid(self, screen:pg.Surface) -> None:
+        
+        self.timer.start()
+        new = not self.scaled
+        if new:
+            pg.transform.scale(self.base_surf, self.grid.dim, self.img_surf)
+            self.scaled = True
         screen.blit(self.img_surf, self.grid.rect)
 
         if self.shw_vel_chk.checked or self.configuring:
-            vel_surf = pg.surfarray.make_surface(self.vel_img)
-            vel_surf.set_colorkey((0, 0, 0))
-            screen.blit(vel_surf, self.grid.rect)
+            screen.blit(self.vel_surf, self.grid.rect)
+        self.timer.lap("blit")
+    
+    def draw_residuals(self, screen:pg.Surface) -> None:
+        """sparkline of pressure residual against solver iterations, log scale"""
+        
+        rect = self.residual_rect
+        pg.draw.rect(screen, config.hvr_clr, rect, 1)
+        residuals = self.grid.residuals[~np.isnan(self.grid.residuals)]
+        if len(residuals) < 2: return
+        
+        log = np.log10(np.maximum(residuals, 1e-300))
+        low, high = log.min(), log.max()
+        x = rect.left + np.linspace(0, rect.width - 1, len(log))
+        y = rect.bottom - 1 - (log - low) / (high - low if high > low else 1) * (rect.height - 2)
+        pg.draw.lines(screen, config.main_clr, False, np.column_stack((x, y)).tolist())
         
         
     def draw(self, screen:pg.Surface) -> None:
@@ -366,12 +464,10 @@ class SimulationScreen:
             screen.blit(self.wall_surf, get_grid(2, 27))                    #   wall
             screen.blit(self.angle_surf, get_grid(2, 21))                   #   angle
         self.draw_grid(screen)
+        if self.shw_debug_chk.checked and self.residual_chk.checked:
+            self.draw_residuals(screen)
 
         for widget in self._widgets():
-            if widget.id == self.smoke_only_chk.id:
-                if self.dsp_field != "Pressure": 
-                    continue
-                
             if isinstance(widget, Dropdown):
                 widget.draw_parent(screen)
                 continue
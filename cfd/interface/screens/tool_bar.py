@@ -5,6 +5,7 @@ import logging
 from cfd.settings.manager import settings
 from cfd.interface.config import Events, Screens, config
 from cfd.interface.widgets import Widget, NULLWIDGET, RectButton, WindowButton, SideBarButton
+from cfd.helpers.logger import RATE_LIMITED
 
 logger = logging.getLogger(__name__)
 
@@ -58,7 +59,7 @@ class ToolBar:
         if not hovered: self.hovering = NULLWIDGET
         
         if hovering != self.hovering:
-            logger.debug(f"Hovering {self.hovering.name}")
+            logger.debug(f"Hovering {self.hovering.name}", extra=RATE_LIMITED)
     
     def _handle_button_clicked(self) -> str | None:
         """calls function if a button is clicked"""
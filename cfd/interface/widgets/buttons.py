@@ -70,6 +70,7 @@ class SideBarButton(Widget):
         #   load and scale image
         self.image: pg.Surface = load_image(image)
         self.scaled_image = pg.transform.scale(self.image, self._size) if self.image else None
+        self._recoloured: dict[tuple, pg.Surface] = {}      #   recoloured images by colour, made when first drawn
         if self.scaled_image:
             self.rect = self.scaled_image.get_rect(center=self.center)
         else:
@@ -89,8 +90,10 @@ class SideBarButton(Widget):
         if self.hovering: pg.draw.circle(screen, self._bg_clr, self.center, self._radius)
         
         if self.scaled_image: 
-            image: pg.Surface = recolour_image(self.scaled_image.copy(),  (0, 0, 0), self._main_clr)
-            screen.blit(image, self.rect)
+            colour = tuple(self._main_clr)
+            if colour not in self._recoloured:
+                self._recoloured[colour] = recolour_image(self.scaled_image.copy(),  (0, 0, 0), colour)
+            screen.blit(self._recoloured[colour], self.rect)
         else:
             #   draw "?" if image file is missing
             pg.draw.rect(screen, self._main_clr, self.rect, 1)
@@ -6,7 +6,7 @@ from .widget import Widget, NULLWIDGET
 
 class CheckBox(Widget):
     
-    def __init__(self, name: str, pos: tuple, text = None, font = config.font["body"], checked=False) -> None:
+    def __init__(self, name: str, pos: tuple, text = None, font:pg.font.Font = None, checked=False) -> None:
         super().__init__(name=name, rect=pg.Rect(pos, (0, 0)), text=text, font=font)
         
         self._radius = 0.4 * self._font.get_height()
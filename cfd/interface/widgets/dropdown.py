@@ -7,7 +7,7 @@ from .widget import Widget, NULLWIDGET
 
 class Dropdown(Widget):
     
-    def __init__(self, name:str, rect:pg.Rect, options:list[str], setting, font=config.font["body"], anchor:str=None) -> None:
+    def __init__(self, name:str, rect:pg.Rect, options:list[str], setting, font:pg.font.Font=None, anchor:str=None) -> None:
         
         self.text = self.get_selected(setting)
         super().__init__(name=name, rect=rect, anchor=anchor, text=self.text, font=font)
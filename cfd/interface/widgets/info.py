@@ -6,7 +6,7 @@ from cfd.interface.widgets import Widget
 
 class Info(Widget):
     
-    def __init__(self, name:str, title:str, pos:tuple, description:str=None, line_max:int=45, font=config.font["body"], desc_font=config.font["sub"]) -> None:
+    def __init__(self, name:str, title:str, pos:tuple, description:str=None, line_max:int=45, font:pg.font.Font=None, desc_font:pg.font.Font=None) -> None:
         super().__init__(name=name, rect=pg.Rect(pos, (0, 0)), font=font)
         
         self.title = title
@@ -14,7 +14,7 @@ class Info(Widget):
         self._description = self.break_description(description) if description else None
         
         self.pos = self.rect.topleft
-        self._desc_font = desc_font
+        self._desc_font = desc_font if desc_font else config.font["sub"]
         self._radius = 0.4 * self._font.get_height()
         self._padding = self._border * np.array((10, 5))
         self.update()
@@ -8,8 +8,8 @@ from .widget import Widget
 
 class Slidebar(Widget):
     
-    def __init__(self, name:str, rect:pg.Surface, min_val:float, max_val:float, step:float, default:float, font=config.font["sub"]) -> None:
-        super().__init__(name=name, rect=rect, font=font, anchor="center")
+    def __init__(self, name:str, rect:pg.Surface, min_val:float, max_val:float, step:float, default:float, font:pg.font.Font=None) -> None:
+        super().__init__(name=name, rect=rect, font=font if font else config.font["sub"], anchor="center")
 
         min_v, max_v, s, dft = Decimal(str(min_val)), Decimal(str(max_val)), Decimal(str(step)), Decimal(str(default))
         if s <= 0: raise ValueError("val_step must be greater than zero")
@@ -3,13 +3,26 @@ from pygame._sdl2.video import Window
 
 import logging
 
+from cfd.settings.manager import settings
 from cfd.interface.config import config
+from cfd.helpers.time import Timeline
+from cfd.helpers import threads
+from cfd.simulation import warmup
 from cfd.app import App    
 
-def main() -> None:
+def main(start:float=None) -> None:
     
     logger = logging.getLogger("cfd.main")
-    logger.info("Finished compiling algorithms")
+    startup = Timeline(start)
+    startup.mark("imports")
+    
+    settings.load()
+    startup.mark("settings")
+    
+    #   compile algorithms while the library screen is already interactive
+    threads.configure()
+    warmup.start()
+    startup.mark("kernel thread")
     
     #   initialise pygame screen
     logger.info("Initialising Pygame")
@@ -21,10 +34,13 @@ def main() -> None:
     window.resizable = False
     pg.display.set_caption("Eulerian CFD")
     logger.info("Initialised Pygame")
+    startup.mark("pygame")
 
     #   initialise config
     config.__init__(screen.get_width(), screen.get_height())
     logger.info("Initialised interface config")
+    startup.mark("config")
     
-    app = App(screen)
-    app.run()
\ No newline at end of file
+    app = App(screen, startup)
+    startup.mark("app")
+    app.run()
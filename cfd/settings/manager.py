@@ -8,15 +8,18 @@ log = logging.getLogger(__name__)
 
 class Settings:
 
-    def __init__(self, theme_name="dark", fps=60, show_fps=False, iterator=50, sor_weight=1.6) -> None:
+    def __init__(self, theme_name="dark", fps=60, show_fps=False, iterator=50, sor_weight=1.6, num_threads=0, threading_layer="default", steps_per_frame=1, render_every=1) -> None:
+        """starts with default settings, saved settings are read by load() once the program starts"""
         
-        os.makedirs(os.path.dirname(self.path), exist_ok=True)
         self.theme_name = theme_name
         self.fps = fps
         self.show_fps = show_fps
         self.iterator = iterator
         self.sor_weight = sor_weight
-        self.load()
+        self.num_threads = num_threads              #   0 - use every thread
+        self.threading_layer = threading_layer
+        self.steps_per_frame = steps_per_frame      #   simulation steps run before every displayed frame
+        self.render_every = render_every            #   field images are regenerated every n-th frame
     
     @property
     def path(self): return os.path.join("local", "settings.json")
@@ -27,6 +30,7 @@ class Settings:
         """save current settings to json file"""
         
         try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
             with open(self.path, "w") as file:
                 json.dump(self.__dict__, file, indent=4)    #   turns all attributes into a dictionary and store into settings.json
                 log.info("Settings successfully saved")
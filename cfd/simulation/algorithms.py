@@ -25,17 +25,57 @@ def free_slip_wall_check(num_cells:int, w:np.ndarray[np.uint8], u:np.ndarray[np.
                 v[i, j] = 0
             
 #   ==========[ PROJECTION ]==========
-@njit("void(uint16, float32, uint8[:, :], float64[:, :], float64[:, :], float64[:, :])", cache=True, parallel=True, fastmath=True)
-def get_divergence_field(num_cells:int, cell_size:float, w:np.ndarray[np.uint8], u:np.ndarray[np.float64], v:np.ndarray[np.float64], div:np.ndarray[np.float64]) -> None:
-    """get how much vectors around each cell diverge from it. Calculated by total outflow divided by cell size"""
+#   columns of per-row partial sums get_divergence_field can accumulate
+ABS_DIV, SQ_DIV, FLUID, SQ_SPEED, MAX_SPEED = range(5)
 
+@njit("void(uint16, float32, uint8[:, :], float64[:, :], float64[:, :], float64[:, :], float64[:, :])", cache=True, parallel=True, fastmath=True)
+def get_divergence_field(num_cells:int, cell_size:float, w:np.ndarray[np.uint8], u:np.ndarray[np.float64], v:np.ndarray[np.float64], div:np.ndarray[np.float64], partials:np.ndarray[np.float64]) -> None:
+    """
+    get how much vectors around each cell diverge from it. Calculated by total outflow divided by cell size.\n
+    partials - (num_cells, 5) row sums of |div|, div^2 and fluid cells, sum of squared and max cell centred speed of
+    interior cells, filled in the same pass. pass an empty (0, 5) array to skip them
+    """
+    stats = len(partials) > 0
+    if stats: partials[0, :] = partials[-1, :] = 0
     for i in prange(1, num_cells - 1):
-        for j in prange(1, num_cells - 1):
+        abs_div = sq_div = fluid = sq_speed = max_speed = 0.0
+        for j in range(1, num_cells - 1):
+            if stats:
+                cu = 0.5 * (u[i, j] + u[i, j+1])
+                cv = 0.5 * (v[i, j] + v[i+1, j])
+                speed_sq = cu * cu + cv * cv
+                sq_speed += speed_sq
+                max_speed = max(max_speed, speed_sq)
             if w[i, j] == 0: div[i, j] = 0; continue
             
             x_grad = (u[i, j+1] - u[i, j]) / cell_size
             y_grad = (v[i, j] - v[i+1, j]) / cell_size
             div[i, j] = x_grad + y_grad
+            if stats:
+                abs_div += abs(div[i, j])
+                sq_div += div[i, j] * div[i, j]
+                fluid += 1
+        
+        if stats:
+            partials[i, ABS_DIV] = abs_div
+            partials[i, SQ_DIV] = sq_div
+            partials[i, FLUID] = fluid
+            partials[i, SQ_SPEED] = sq_speed
+            partials[i, MAX_SPEED] = np.sqrt(max_speed)
+
+@njit("void(float32, uint16, float32, float32, uint8[:, :], float64[:, :], float64[:, :], float32)", cache=True, fastmath=True, inline="always")
+def pressure_sweep(dt:float, num_cells:int, cell_size_sq:float, density:float, w:np.ndarray[np.uint8], div:np.ndarray[np.float64], p:np.ndarray[np.float64], sor_weight:float) -> None:
+    """one Gauss-Seidel sweep over the pressure field"""
+
+    for i in range(1, num_cells - 1):
+        for j in range(1, num_cells - 1):
+            w_l, w_r, w_t, w_b = w[i-1, j], w[i+1, j], w[i, j-1], w[i, j+1]
+            num_fluid_cells = w_l + w_r + w_t + w_b
+            if w[i, j] == 0 or num_fluid_cells == 0: p[i, j] = 0; continue
+            
+            adj_p_sum = (p[i-1, j] * w_l) + (p[i+1, j] * w_r) + (p[i, j-1] * w_t) + (p[i, j+1] * w_b)
+            new_p = (adj_p_sum - density * cell_size_sq * div[i, j] / dt) / num_fluid_cells
+            p[i, j] += (new_p - p[i, j]) * sor_weight       #   successive over-relaxation
 
 @njit("float64[:, :](float32, uint16, float32, float32, uint8[:, :], float64[:, :], uint16, float32)", cache=True, fastmath=True)
 def poisson_pressure_solve(dt:float, num_cells:int, cell_size_sq:float, density:float, w:np.ndarray[np.uint8], div:np.ndarray[np.float64], iter:int, sor_weight:float) -> np.ndarray[np.float64, np.float64]:
@@ -43,15 +83,39 @@ def poisson_pressure_solve(dt:float, num_cells:int, cell_size_sq:float, density:
     
     p = np.zeros((num_cells, num_cells), dtype=np.float64)
     for _ in range(iter):
-        for i in range(1, num_cells - 1):
-            for j in range(1, num_cells - 1):
-                w_l, w_r, w_t, w_b = w[i-1, j], w[i+1, j], w[i, j-1], w[i, j+1]
-                num_fluid_cells = w_l + w_r + w_t + w_b
-                if w[i, j] == 0 or num_fluid_cells == 0: p[i, j] = 0; continue
-                
-                adj_p_sum = (p[i-1, j] * w_l) + (p[i+1, j] * w_r) + (p[i, j-1] * w_t) + (p[i, j+1] * w_b)
-                new_p = (adj_p_sum - density * cell_size_sq * div[i, j] / dt) / num_fluid_cells
-                p[i, j] += (new_p - p[i, j]) * sor_weight       #   successive over-relaxation
+        pressure_sweep(dt, num_cells, cell_size_sq, density, w, div, p, sor_weight)
+    return p
+
+@njit("float64(float32, uint16, float32, float32, uint8[:, :], float64[:, :], float64[:, :])", cache=True, parallel=True, fastmath=True)
+def pressure_residual(dt:float, num_cells:int, cell_size_sq:float, density:float, w:np.ndarray[np.uint8], div:np.ndarray[np.float64], p:np.ndarray[np.float64]) -> np.float64:
+    """
+    root mean square residual of Poisson's pressure equation over fluid cells.\n
+    scaled to units of divergence (s^-1), roughly the divergence projection will leave behind
+    """
+    k = dt / (density * cell_size_sq)
+    total = 0.0
+    count = 0
+    for i in prange(1, num_cells - 1):
+        for j in range(1, num_cells - 1):
+            w_l, w_r, w_t, w_b = w[i-1, j], w[i+1, j], w[i, j-1], w[i, j+1]
+            num_fluid_cells = w_l + w_r + w_t + w_b
+            if w[i, j] == 0 or num_fluid_cells == 0: continue
+            
+            adj_p_sum = (p[i-1, j] * w_l) + (p[i+1, j] * w_r) + (p[i, j-1] * w_t) + (p[i, j+1] * w_b)
+            r = (adj_p_sum - num_fluid_cells * p[i, j]) * k - div[i, j]
+            total += r * r
+            count += 1
+    return np.sqrt(total / count) if count else 0.0
+
+@njit("float64[:, :](float32, uint16, float32, float32, uint8[:, :], float64[:, :], uint16, float32, uint16, float64[:])", cache=True, fastmath=True)
+def poisson_pressure_solve_residuals(dt:float, num_cells:int, cell_size_sq:float, density:float, w:np.ndarray[np.uint8], div:np.ndarray[np.float64], iter:int, sor_weight:float, every:int, residuals:np.ndarray[np.float64]) -> np.ndarray[np.float64, np.float64]:
+    """same as poisson_pressure_solve, also writes the residual after every few sweeps into residuals"""
+    
+    p = np.zeros((num_cells, num_cells), dtype=np.float64)
+    for n in range(1, iter + 1):
+        pressure_sweep(dt, num_cells, cell_size_sq, density, w, div, p, sor_weight)
+        if n % every == 0 and n // every <= len(residuals):
+            residuals[n // every - 1] = pressure_residual(dt, num_cells, cell_size_sq, density, w, div, p)
     return p
                 
 
@@ -177,13 +241,18 @@ def semi_lagrangian_advect_velocity(dt:float, cell_size:float, num_cells:int, w:
             new_idx = old_idx - np.flip(old_vel) * k
             nv[i, j] = get_v_at_pos(num_cells, v, new_idx)
 
-@njit("void(float32, float32, uint16, uint8[:, :], float64[:, :], float64[:, :], float64[:, :],  float64[:, :])", cache=True, parallel=True, fastmath=True)
-def semi_lagrangian_advect_smoke(dt:float, cell_size:float, num_cells:int, w:np.ndarray[np.uint8], s:np.ndarray[np.float64], ns:np.ndarray[np.float64], u:np.ndarray[np.float64], v:np.ndarray[np.float64]) -> None:
-    """calculate new smoke density by backtracking by dt and bilinear interpolate between 4 cells"""
-    
+@njit("void(float32, float32, uint16, uint8[:, :], float64[:, :], float64[:, :], float64[:, :], float64[:, :], float64[:])", cache=True, parallel=True, fastmath=True)
+def semi_lagrangian_advect_smoke(dt:float, cell_size:float, num_cells:int, w:np.ndarray[np.uint8], s:np.ndarray[np.float64], ns:np.ndarray[np.float64], u:np.ndarray[np.float64], v:np.ndarray[np.float64], mass:np.ndarray[np.float64]) -> None:
+    """
+    calculate new smoke density by backtracking by dt and bilinear interpolate between 4 cells.\n
+    mass - (num_cells,) row sums of new smoke density filled in the same pass, pass an empty array to skip them
+    """
+    stats = len(mass) > 0
+    if stats: mass[0] = mass[-1] = 0
     k = dt / cell_size
     for i in prange(1, num_cells - 1):
-        for j in prange(1, num_cells - 1):
+        row = 0.0
+        for j in range(1, num_cells - 1):
             if w[i, j] == 0: ns[i, j] = 0; continue
             
             #   get velocity at cell center
@@ -193,6 +262,8 @@ def semi_lagrangian_advect_smoke(dt:float, cell_size:float, num_cells:int, w:np.
             #   backtrack
             new_idx = old_idx - np.flip(old_vel) * k
             ns[i, j] = get_smoke_at_pos(num_cells, s, new_idx)
+            row += ns[i, j]
+        if stats: mass[i] = row
 
 #   ==========[ DIFFUSION ]==========
 @njit("void(float32, uint16, uint8[:, :], float64[:, :], uint16, float32)", cache=True, fastmath=True)
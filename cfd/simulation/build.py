@@ -0,0 +1,39 @@
+"""
+ahead-of-time build step, compiles every kernel into numba's on-disk cache so launching the program only loads them.\n
+usage: python -m cfd.simulation.build
+"""
+import logging
+from time import perf_counter
+from importlib import import_module
+
+from numba.core.registry import CPUDispatcher
+
+import cfd.helpers.logger as log
+from cfd.simulation.warmup import KERNEL_MODULES
+
+logger = logging.getLogger(__name__)
+
+
+def build() -> dict[str, tuple[int, int]]:
+    """compiles all kernel modules, returns cache (hits, misses) of every kernel"""
+
+    stats: dict[str, tuple[int, int]] = {}
+    for name in KERNEL_MODULES:
+        start = perf_counter()
+        module = import_module(name)
+        logger.info(f"Built {name} in {perf_counter() - start:.2f}s")
+
+        for attr, kernel in vars(module).items():
+            if not isinstance(kernel, CPUDispatcher) or kernel.__module__ != name: continue
+            hits, misses = sum(kernel.stats.cache_hits.values()), sum(kernel.stats.cache_misses.values())
+            stats[f"{name}.{attr}"] = hits, misses
+            logger.debug(f"{attr}: {'loaded from cache' if hits and not misses else 'compiled'} ({kernel.stats.cache_path})")
+
+    compiled = sum(1 for _, misses in stats.values() if misses)
+    logger.info(f"{len(stats)} kernels ready, {compiled} compiled and {len(stats) - compiled} loaded from cache")
+    return stats
+
+
+if __name__ == "__main__":
+    log.init()
+    build()
@@ -0,0 +1,92 @@
+import numpy as np
+from numba import njit, prange
+
+LUT_SIZE = 1024
+TILE = 32           #   cells along each side of the blocks images are written in
+
+
+def linear_segments(points:list[tuple[float, tuple[int, int, int]]], size:int=LUT_SIZE) -> np.ndarray[np.uint8]:
+    """lookup table interpolating linearly between (position, colour) points, positions from 0 to 1"""
+
+    positions = np.array([p for p, _ in points], dtype=np.float64)
+    colours = np.array([c for _, c in points], dtype=np.float64)
+    x = np.linspace(0, 1, size)
+    return np.stack([np.interp(x, positions, colours[:, k]) for k in range(3)], axis=-1).round().astype(np.uint8)
+
+#   lookup tables, index 0 is the lowest value
+COLOURMAPS: dict[str, np.ndarray[np.uint8]] = {
+    "grey": linear_segments([(0, (0, 0, 0)), (1, (255, 255, 255))]),
+    "jet": linear_segments([(0, (0, 0, 255)), (0.25, (0, 255, 255)), (0.5, (0, 255, 0)), (0.75, (255, 255, 0)), (1, (255, 0, 0))]),
+    "diverging": linear_segments([(0, (0, 0, 255)), (0.5, (0, 0, 0)), (1, (255, 0, 0))]),     #   inflow blue, outflow red
+    "viridis": linear_segments([(k / 10, c) for k, c in enumerate([
+        (68, 1, 84), (72, 36, 117), (65, 68, 135), (53, 95, 141), (42, 120, 142), (33, 145, 140),
+        (34, 168, 132), (68, 191, 112), (122, 209, 81), (189, 223, 38), (253, 231, 37)
+    ])]),
+}
+_inverted: dict[str, np.ndarray[np.uint8]] = {}
+
+
+def get(name:str, invert=False) -> np.ndarray[np.uint8]:
+    """lookup table of colourmap, inverted tables run from highest to lowest (light theme)"""
+
+    if not invert: return COLOURMAPS[name]
+    if name not in _inverted: _inverted[name] = np.ascontiguousarray(COLOURMAPS[name][::-1])
+    return _inverted[name]
+
+#   ==========[ KERNELS ]==========
+@njit("int64(float64, float64, float64, int64)", cache=True, inline="always")
+def quantise(value:float, low:float, scale:float, size:int) -> int:
+    """index into lookup table of size entries, values outside the range saturate"""
+
+    k = int((value - low) * scale)
+    return 0 if k < 0 else (size - 1 if k > size - 1 else k)
+
+@njit("void(float64[:, :], float64, float64, uint8[:, :], uint8[:, :, :])", cache=True, parallel=True)
+def apply_colourmap(field:np.ndarray[np.float64], low:float, high:float, lut:np.ndarray[np.uint8], img:np.ndarray[np.uint8]) -> None:
+    """
+    colours every cell by looking up its value between low and high.\n
+    img is indexed (x, y) like pygame surfaces, field[i, j] is written to img[j, i] one TILE x TILE block at a time,
+    so neither the reads nor the writes stride through memory whichever way img is laid out
+    """
+    size = len(lut)
+    scale = (size - 1) / (high - low)
+    rows, cols = field.shape
+    for bi in prange(-(-rows // TILE)):
+        for j0 in range(0, cols, TILE):
+            for i in range(bi * TILE, min((bi + 1) * TILE, rows)):
+                for j in range(j0, min(j0 + TILE, cols)):
+                    k = quantise(field[i, j], low, scale, size)
+                    img[j, i, 0] = lut[k, 0]
+                    img[j, i, 1] = lut[k, 1]
+                    img[j, i, 2] = lut[k, 2]
+
+@njit("void(float64[:, :], float64, float64, uint8[:, :], float64[:, :], float64, uint8[:, :, :])", cache=True, parallel=True)
+def apply_weighted_colourmap(field:np.ndarray[np.float64], low:float, high:float, lut:np.ndarray[np.uint8], weight:np.ndarray[np.float64], gain:float, img:np.ndarray[np.uint8]) -> None:
+    """same as apply_colourmap, colours are darkened by gain * weight clipped to [0, 1]"""
+
+    size = len(lut)
+    scale = (size - 1) / (high - low)
+    rows, cols = field.shape
+    for bi in prange(-(-rows // TILE)):
+        for j0 in range(0, cols, TILE):
+            for i in range(bi * TILE, min((bi + 1) * TILE, rows)):
+                for j in range(j0, min(j0 + TILE, cols)):
+                    k = quantise(field[i, j], low, scale, size)
+                    a = min(max(gain * weight[i, j], 0.0), 1.0)
+                    img[j, i, 0] = np.uint8(lut[k, 0] * a)
+                    img[j, i, 1] = np.uint8(lut[k, 1] * a)
+                    img[j, i, 2] = np.uint8(lut[k, 2] * a)
+
+@njit("void(uint8[:, :], uint8[:], uint8[:, :, :])", cache=True, parallel=True)
+def paint_walls(w:np.ndarray[np.uint8], colour:np.ndarray[np.uint8], img:np.ndarray[np.uint8]) -> None:
+    """colours every wall cell (w = 0), in the same order as apply_colourmap"""
+
+    rows, cols = w.shape
+    for bi in prange(-(-rows // TILE)):
+        for j0 in range(0, cols, TILE):
+            for i in range(bi * TILE, min((bi + 1) * TILE, rows)):
+                for j in range(j0, min(j0 + TILE, cols)):
+                    if w[i, j] == 0:
+                        img[j, i, 0] = colour[0]
+                        img[j, i, 1] = colour[1]
+                        img[j, i, 2] = colour[2]
@@ -0,0 +1,154 @@
+import numpy as np
+from numba import njit, prange
+
+from cfd.simulation.algorithms import get_divergence_field, ABS_DIV, SQ_DIV, FLUID, SQ_SPEED, MAX_SPEED
+
+#   fields of the grid every derived quantity is computed from
+DEPENDS = {
+    "divergence": "uvw",
+    "speed": "uv",
+    "vorticity": "uvw",
+    "total_divergence": "uvw",
+    "divergence_norm": "uvw",
+    "total_smoke": "s",
+    "max_speed": "uv",
+    "kinetic_energy": "uv",
+}
+
+
+#   ==========[ KERNELS ]==========
+@njit("void(float64[:, :], float64[:, :], float64[:, :])", cache=True, parallel=True, fastmath=True)
+def get_speed_field(u:np.ndarray[np.float64], v:np.ndarray[np.float64], speed:np.ndarray[np.float64]) -> None:
+    """magnitude of cell centred velocity"""
+
+    rows, cols = speed.shape
+    for i in prange(rows):
+        for j in range(cols):
+            cu = 0.5 * (u[i, j] + u[i, j+1])
+            cv = 0.5 * (v[i, j] + v[i+1, j])
+            speed[i, j] = np.sqrt(cu * cu + cv * cv)
+
+@njit("void(float32, uint8[:, :], float64[:, :], float64[:, :], float64[:, :])", cache=True, parallel=True, fastmath=True)
+def get_vorticity_field(cell_size:float, w:np.ndarray[np.uint8], u:np.ndarray[np.float64], v:np.ndarray[np.float64], vorticity:np.ndarray[np.float64]) -> None:
+    """curl of velocity (dv/dx - du/dy) at cell centres by central differences, anti-clockwise positive, zero in walls"""
+
+    rows, cols = vorticity.shape
+    for i in prange(1, rows - 1):
+        for j in range(1, cols - 1):
+            if w[i, j] == 0: vorticity[i, j] = 0; continue
+            dvdx = (v[i, j+1] + v[i+1, j+1] - v[i, j-1] - v[i+1, j-1]) / (4 * cell_size)
+            dudy = (u[i-1, j] + u[i-1, j+1] - u[i+1, j] - u[i+1, j+1]) / (4 * cell_size)     #   row index increases downwards
+            vorticity[i, j] = dvdx - dudy
+
+
+class DerivedFields:
+    """
+    quantities derived from the fields of a grid, computed when first read after the fields they depend on change.\n
+    whatever writes u, v, s or w calls invalidate() with the fields it wrote, so every quantity is computed at most
+    once per step and only if something reads it. totals are reduced inside the kernels that already visit every cell,
+    the divergence pass fills every velocity total and advection records the total smoke (Grid.diagnostics)
+    """
+
+    def __init__(self, grid) -> None:
+
+        self.grid = grid
+        self._buffers: dict[str, np.ndarray[np.float64]] = {}     #   field buffers, allocated when first computed
+        self._partials = np.zeros((grid.num_cells, 5), dtype=np.float64)     #   per row sums of the divergence pass
+        self._values: dict[str, float] = {}
+        self._dirty = set(DEPENDS)
+
+    def invalidate(self, fields:str="uvsw") -> None:
+        """marks every quantity depending on any of the fields (u, v, s, w) as out of date"""
+        self._dirty.update(name for name, depends in DEPENDS.items() if any(field in depends for field in fields))
+
+    def record(self, **values:float) -> None:
+        """stores totals computed elsewhere for the current fields, e.g. by the step"""
+
+        for name, value in values.items():
+            self._values[name] = value
+            self._dirty.discard(name)
+
+    def _buffer(self, name:str) -> np.ndarray[np.float64]:
+        """buffer of a derived field, fields that are never read take no memory"""
+
+        if name not in self._buffers: self._buffers[name] = np.zeros(self.grid.COLLOCATED_GRID, dtype=np.float64)
+        return self._buffers[name]
+
+    def _ensure_divergence(self) -> None:
+        """runs the divergence pass if it is out of date, it fills the divergence field and every velocity total"""
+
+        divergence = self._buffer("divergence")
+        if not self._stale("divergence"): return
+        g = self.grid
+        get_divergence_field(g.num_cells, g.cell_size, g.w, g.u, g.v, divergence, self._partials)
+        totals = self._partials.sum(axis=0)
+        self.record(
+            total_divergence=float(totals[ABS_DIV]),
+            divergence_norm=float(np.sqrt(totals[SQ_DIV] / totals[FLUID])) if totals[FLUID] else 0.0,
+            max_speed=float(self._partials[:, MAX_SPEED].max()),
+            kinetic_energy=float(0.5 * g.density * g.cell_size ** 2 * totals[SQ_SPEED])
+        )
+
+    def _stale(self, name:str) -> bool:
+        """True once after name was invalidated, the caller then recomputes it"""
+
+        if name not in self._dirty: return False
+        self._dirty.discard(name)
+        return True
+
+    #   ==========[ FIELDS ]==========
+    @property
+    def divergence(self) -> np.ndarray[np.float64]:
+        """divergence left in the current velocities, unlike Grid.div which is the divergence the pressure solve removed"""
+
+        self._ensure_divergence()
+        return self._buffers["divergence"]
+
+    @property
+    def speed(self) -> np.ndarray[np.float64]:
+
+        speed = self._buffer("speed")
+        if self._stale("speed"): get_speed_field(self.grid.u, self.grid.v, speed)
+        return speed
+
+    @property
+    def vorticity(self) -> np.ndarray[np.float64]:
+
+        vorticity = self._buffer("vorticity")
+        if self._stale("vorticity"):
+            g = self.grid
+            get_vorticity_field(g.cell_size, g.w, g.u, g.v, vorticity)
+        return vorticity
+
+    #   ==========[ TOTALS ]==========
+    def _total(self, name:str) -> float:
+        """total filled by the divergence pass, runs the pass if it is out of date"""
+
+        if name in self._dirty: self._ensure_divergence()
+        return self._values[name]
+
+    @property
+    def total_divergence(self) -> float:
+        """sum of magnitude of divergence of every cell"""
+        return self._total("total_divergence")
+
+    @property
+    def divergence_norm(self) -> float:
+        """root mean square divergence of fluid cells"""
+        return self._total("divergence_norm")
+
+    @property
+    def max_speed(self) -> float:
+        """fastest cell centred speed away from the border"""
+        return self._total("max_speed")
+
+    @property
+    def kinetic_energy(self) -> float:
+        """kinetic energy per meter of depth in joules, from cell centred velocities away from the border"""
+        return self._total("kinetic_energy")
+
+    @property
+    def total_smoke(self) -> float:
+
+        if self._stale("total_smoke"): self._values["total_smoke"] = float(np.sum(self.grid.s))
+        return self._values["total_smoke"]
@@ -0,0 +1,61 @@
+import numpy as np
+from numba import njit, prange
+
+
+#   ==========[ EMITTER KERNEL ]==========
+@njit("void(float64[:, :], float64[:, :], float64[:, :], float64, int32[:], float64[:], int32[:], float64[:], int32[:], float64[:])", cache=True, parallel=True)
+def apply_emitters(u:np.ndarray[np.float64], v:np.ndarray[np.float64], s:np.ndarray[np.float64], gravity_dv:float, u_idx:np.ndarray[np.int32], u_val:np.ndarray[np.float64], v_idx:np.ndarray[np.int32], v_val:np.ndarray[np.float64], s_idx:np.ndarray[np.int32], s_val:np.ndarray[np.float64]) -> None:
+    """
+    add gravity to vertical velocities, then overwrite fields with their sources.\n
+    smoke sources always apply, velocity sources only where they are stronger than the current velocity
+    """
+    if gravity_dv != 0:
+        rows, cols = v.shape
+        for i in prange(1, rows - 1):
+            for j in range(1, cols - 1):
+                v[i, j] += gravity_dv
+
+    cols = s.shape[1]
+    for n in prange(len(s_idx)):
+        s[s_idx[n] // cols, s_idx[n] % cols] = s_val[n]
+
+    cols = u.shape[1]
+    for n in prange(len(u_idx)):
+        i, j = u_idx[n] // cols, u_idx[n] % cols
+        if abs(u_val[n]) > abs(u[i, j]): u[i, j] = u_val[n]
+
+    cols = v.shape[1]
+    for n in prange(len(v_idx)):
+        i, j = v_idx[n] // cols, v_idx[n] % cols
+        if abs(v_val[n]) > abs(v[i, j]): v[i, j] = v_val[n]
+
+
+#   ==========[ EMITTERS ]==========
+def sources(field:np.ndarray, positive:bool=False) -> tuple[np.ndarray[np.int32], np.ndarray[np.float64]]:
+    """flat index and value of every source in a field, sources are non-zero or positive values"""
+
+    flat = np.ravel(field)
+    idx = np.flatnonzero(flat)
+    val = flat[idx]
+    if positive:
+        idx, val = idx[val > 0], val[val > 0]
+    return idx.astype(np.int32), np.ascontiguousarray(val, dtype=np.float64)
+
+
+class Emitters:
+    """
+    initial conditions compiled into lists of source cells, so applying them every step only visits the sources.\n
+    has to be rebuilt whenever the initial conditions change
+    """
+
+    def __init__(self, u0:np.ndarray, v0:np.ndarray, s0:np.ndarray) -> None:
+
+        self.u_idx, self.u_val = sources(u0)
+        self.v_idx, self.v_val = sources(v0)
+        self.s_idx, self.s_val = sources(s0, positive=True)
+
+    def __len__(self) -> int:
+        return len(self.u_idx) + len(self.v_idx) + len(self.s_idx)
+
+    def apply(self, u:np.ndarray, v:np.ndarray, s:np.ndarray, gravity_dv:float) -> None:
+        apply_emitters(u, v, s, gravity_dv, self.u_idx, self.u_val, self.v_idx, self.v_val, self.s_idx, self.s_val)
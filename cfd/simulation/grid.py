@@ -1,10 +1,23 @@
 import numpy as np
 import pygame as pg
 
+from typing import Callable
+
 from cfd.helpers.files import Project, read_project, save_project
 from cfd.interface.config import config
 from cfd.settings.manager import settings
+from cfd.helpers.profiler import StageTimer
 from cfd.simulation.algorithms import *
+from cfd.simulation.emitters import Emitters
+from cfd.simulation.pipeline import fused_step
+from cfd.simulation.derived import DerivedFields
+from cfd.simulation.render import ARROW_SLOW, ARROW_FAST, draw_velocity_arrows, line_integral_convolution
+from cfd.simulation import colourmaps
+from cfd.simulation.resample import resample_velocity
+from cfd.simulation.colourmaps import apply_colourmap, apply_weighted_colourmap, paint_walls
+
+LIC_CELLS = 256         #   most line integral convolution samples across the grid
+LIC_LENGTH = 12         #   streamline steps either way of every sample
 
 class Grid:
     
@@ -21,10 +34,18 @@ class Grid:
         self.surf = pg.Surface(self.dim)
         self.rect = self.surf.get_rect(bottomright=np.array((config.width, config.height)) - int((0.98 * config.height - self.dim[1]) / 2) * np.ones(2))
         
-        # screen coord of cell centers
-        side = np.arange(self.num_cells) * self.cell_px + self.cell_px // 2
-        x, y = np.meshgrid(side, side)
-        self.pos = np.stack((x, y))
+        #   velocity arrows, one per block of cells so there are at most 64 across, blocks may cover fractions of cells
+        arrow_blocks = -(-self.num_cells // -(-self.num_cells // 64))
+        self.arrow_u = np.zeros((arrow_blocks, arrow_blocks), dtype=np.float64)
+        self.arrow_v = np.zeros((arrow_blocks, arrow_blocks), dtype=np.float64)
+        self.arrow_px = self.cell_px * self.num_cells / arrow_blocks
+        self.arrow_lut = colourmaps.linear_segments([(0, ARROW_SLOW), (1, ARROW_FAST)], 64)
+        
+        #   line integral convolution, at most LIC_CELLS samples across so its cost does not grow with resolution
+        self.lic_stride = -(-self.num_cells // LIC_CELLS)
+        self.lic_noise: np.ndarray = None       #   one value per sample, created with lic when first drawn
+        self.lic: np.ndarray = None
+        self.lic_calls = 0
         
         self.gravity = project.options["gravity"]
         self.density = project.options["density"]
@@ -39,14 +60,31 @@ class Grid:
         self.ns = np.zeros(self.COLLOCATED_GRID, dtype=np.float64)      #   smoke field
         self.p = np.zeros(self.COLLOCATED_GRID, dtype=np.float64)       #   pressure field
         
+        #   pressure solver telemetry
+        self.residual_every = 0                 #   record residual every n sweeps, 0 - off
+        self.residuals = np.zeros(0)            #   residual history of latest pressure solve
+        self.residual = np.nan                  #   residual after latest pressure solve
+        
+        self.derived = DerivedFields(self)      #   divergence, speed, vorticity and totals, computed when read
+        self.diagnostics = False                #   sum smoke during advection so its total is known without another pass
+        self.smoke_mass = np.zeros(self.num_cells)
+        self._no_mass = np.zeros(0)
+        self._no_partials = np.zeros((0, 5))
+        
         #   initial conditions
         self.u0 = self.u.copy()
         self.v0 = self.v.copy()
         self.s0 = self.s.copy()
+        self.compile_emitters()
         
     #   ==========[ INITIAL CONDITIONS ]==========
     def save_conditions(self, project: Project) -> None:
         save_project(project.path, self.u0, self.v0, self.s0, self.w)
+        self.compile_emitters()
+    
+    def compile_emitters(self) -> None:
+        """collect sources of the initial conditions, has to run after they change"""
+        self.emitters = Emitters(self.u0, self.v0, self.s0)
         
     def load_conditions(self, project: Project) -> None:
         
@@ -62,6 +100,27 @@ class Grid:
             self.w = np.ones(self.COLLOCATED_GRID, dtype=np.uint8)
             self.w[1:-1, 1] = self.w[1:-1, -2] = self.w[1, 2:-2] = self.w[-2, 2:-2] = 0
     
+    def clear_conditions(self) -> None:
+        
+        self.u0[:, :] = 0
+        self.v0[:, :] = 0
+        self.s0[:, :] = 0
+        self.w[:, :] = 1
+        self.derived.invalidate("w")
+        self.compile_emitters()
+    
+    def wind_tunnel(self) -> None:
+        """preset with walls at the top and bottom, wind and a smoke stream blowing in from the left"""
+        
+        self.clear_conditions()
+        mid = self.num_cells // 2
+        length = self.num_cells // 30
+        self.w[1, :] = self.w[-2, :] = 0
+        self.derived.invalidate("w")
+        self.u0[:, 1:4] = self.env_length * 2
+        self.s0[mid-length:mid+length, 1:4] = 1
+        self.compile_emitters()
+    
     #   ==========[ UTILITIES ]==========        
     def hovered_cell(self, mouse_pos) -> tuple[int, int] | None:
         idx = None
@@ -70,55 +129,118 @@ class Grid:
             idx = None if np.any((idx < 0) | (idx >= self.num_cells)) else tuple(np.flip(idx).tolist())
         return idx
     
-    def shrink_field(self, arr: np.ndarray) -> np.ndarray:
-        side = arr.shape[0]
-        if side <= 64 or side % 2 == 1: return arr
-        arr = arr.reshape(side // 2, 2, side).sum(axis=1)               #   merge every two rows by summing their respective column values  (shrink vertically)
-        arr = arr.reshape(side // 2, side // 2, 2).sum(axis=-1)         #   for every new rows, sum every two values into one               (shrink horizontally)
-        return self.shrink_field(0.25 * arr)
-
     def reset(self) -> None:
-            
+        
         self.u[:, :] = self.u0
         self.v[:, :] = self.v0
         self.s[:, :] = self.s0
+        self.derived.invalidate()
+        self.compile_emitters()
     
     #   ==========[ UPDATE ]==========
     def set_boundary_values(self) -> None:
         np.clip(self.s, 0, 1, out=self.s)
         free_slip_wall_check(self.num_cells, self.w, self.u, self.v)
+        self.derived.invalidate("uvs")
         
     def add_external_forces(self) -> None:
-        self.v[1:-1, 1:-1] += self.dt * self.gravity * -9.81   #   gravity
-
-        #   smoke sources
-        init_smoke = self.s0 > 0
-        self.s[init_smoke] = self.s0[init_smoke]
-        
-        #   velocity sources
-        init_u = np.abs(self.u0) > np.abs(self.u)
-        self.u[init_u] = self.u0[init_u]
-        
-        init_v = np.abs(self.v0) > np.abs(self.v)
-        self.v[init_v] = self.v0[init_v]
+        """gravity and sources of initial conditions"""
+        self.emitters.apply(self.u, self.v, self.s, self.dt * self.gravity * -9.81)
+        self.derived.invalidate("uvs")
     
     def calculate_divergence(self) -> None:
-        get_divergence_field(self.num_cells, self.cell_size, self.w, self.u, self.v, self.div)
+        """divergence of current velocities for the pressure solve, see derived.divergence for display"""
+        get_divergence_field(self.num_cells, self.cell_size, self.w, self.u, self.v, self.div, self._no_partials)
     
     def calculate_pressure(self, iter, sor_weight) -> None:
-        self.p = poisson_pressure_solve(self.dt, self.num_cells, self.cell_size ** 2, self.density, self.w, self.div, iter, sor_weight)
+        
+        if not self.residual_every:
+            self.p = poisson_pressure_solve(self.dt, self.num_cells, self.cell_size ** 2, self.density, self.w, self.div, iter, sor_weight)
+            return
+        
+        if len(self.residuals) != iter // self.residual_every:
+            self.residuals = np.full(iter // self.residual_every, np.nan)
+        self.p = poisson_pressure_solve_residuals(self.dt, self.num_cells, self.cell_size ** 2, self.density, self.w, self.div, iter, sor_weight, self.residual_every, self.residuals)
+        self.residual = self.residuals[-1] if iter % self.residual_every == 0 and len(self.residuals) else pressure_residual(self.dt, self.num_cells, self.cell_size ** 2, self.density, self.w, self.div, self.p)
+    
+    @property
+    def divergence_norm(self) -> float:
+        """root mean square divergence left after latest step"""
+        return self.derived.divergence_norm
         
     def project_velocities(self) -> None:
         pressure_projection(self.dt, self.num_cells, self.cell_size, self.density, self.w, self.p, self.u, self.v)
+        self.derived.invalidate("uv")
     
     def advect_velocities(self) -> None:
         semi_lagrangian_advect_velocity(self.dt, self.cell_size, self.num_cells, self.w, self.u, self.v, self.nu, self.nv)
         self.u[:, :] = self.nu
         self.v[:, :] = self.nv
+        self.derived.invalidate("uv")
     
     def advect_smoke(self) -> None:
-        semi_lagrangian_advect_smoke(self.dt, self.cell_size, self.num_cells, self.w, self.s, self.ns, self.u, self.v)
+        semi_lagrangian_advect_smoke(self.dt, self.cell_size, self.num_cells, self.w, self.s, self.ns, self.u, self.v, self.smoke_mass if self.diagnostics else self._no_mass)
         self.s[:, :] = self.ns
+        self.derived.invalidate("s")
+        
+    def step(self, iter:int, sor_weight:float, project=True, advect=True, timer:StageTimer=None, steps:int=1, fused=True) -> None:
+        """
+        advance simulation by steps, runs as a single compiled call unless stages are timed or solver telemetry is on
+        """
+        if not fused or timer or self.residual_every:
+            for _ in range(steps): self.step_stages(iter, sor_weight, project, advect, timer)
+            return
+        
+        e = self.emitters
+        fused_step(self.num_cells, self.dt, self.cell_size, self.cell_size ** 2, self.density, self.dt * self.gravity * -9.81, self.w,
+                   self.u, self.v, self.s, self.nu, self.nv, self.ns, self.div, self.p,
+                   e.u_idx, e.u_val, e.v_idx, e.v_val, e.s_idx, e.s_val, iter, sor_weight, project, advect, steps, self.smoke_mass if self.diagnostics else self._no_mass)
+        self.derived.invalidate("uvs")
+        if self.diagnostics and advect: self.derived.record(total_smoke=float(self.smoke_mass.sum()))
+        
+    def advance(self, steps:int, iter:int, sor_weight:float, callback:Callable[["Grid", int], None]=None, every:int=0) -> None:
+        """
+        advance simulation by steps without rendering, steps between callbacks run in a single compiled call.\n
+        :param callback: called with the grid and number of steps done after every `every` steps and after the last step
+        """
+        chunk = every if callback and every > 0 else steps
+        done = 0
+        while done < steps:
+            n = min(chunk, steps - done)
+            self.step(iter, sor_weight, steps=n)
+            done += n
+            if callback: callback(self, done)
+        
+    def step_stages(self, iter:int, sor_weight:float, project=True, advect=True, timer:StageTimer=None) -> None:
+        """advance simulation by one time step one kernel at a time, stages are lapped on timer if given"""
+        
+        lap = timer.lap if timer else lambda stage: None
+        
+        #   1. add external sources
+        self.add_external_forces()
+        lap("forces")
+        self.set_boundary_values()
+        lap("boundary")
+        
+        #   2. move smoke and velocity around
+        if advect:
+            self.advect_smoke()
+            self.advect_velocities()
+            np.clip(self.s, 0, 1, out=self.s)
+            lap("advection")
+        
+        #   3. clears out divergence to enforce incompressibility
+        self.calculate_divergence()
+        lap("divergence")
+        self.calculate_pressure(iter, sor_weight)
+        lap("pressure")
+        if project:
+            self.project_velocities()
+            lap("projection")
+
+        self.set_boundary_values()
+        lap("boundary")
+        if self.diagnostics and advect: self.derived.record(total_smoke=float(self.smoke_mass.sum()))
         
     #def diffuse_smoke(self, iter, sor_weight) -> None:
     #    smoke_diffusion(self.dt, self.num_cells, self.w, self.s, iter, sor_weight)
@@ -158,69 +280,48 @@ class Grid:
     
     def get_walls_field_img(self, img:np.ndarray) -> None:
 
-        is_wall = self.w.T == 0
-        img[is_wall] = config.hvr_clr
+        paint_walls(self.w, np.array(config.hvr_clr[:3], dtype=np.uint8), img)
     
     def get_smoke_field_img(self, img:np.ndarray, initial=False) -> None:
         
-        if not initial:
-            np.clip(self.s, 0, 1, out=self.s)
-            s = self.s.copy().T
-        else:
-            np.clip(self.s0, 0, 1, out=self.s0)
-            s = self.s0.copy().T
-        if settings.theme_name == "light":
-            s = 1 - s
-        c = (255 * s).astype(np.uint8)
-        img[:, :] = np.stack([c] * 3, axis=-1)
-    
-    def get_divergence_field_img(self, img:np.ndarray) -> None:
-        div = np.clip(self.div, -5, 5).T
-        norm = div / 5
-        r = (255 * np.where(norm > 0, norm, 0)).astype(np.uint8)        #   red if outflow
-        g = np.zeros_like(norm)
-        b = (255 * np.where(norm < 0, -norm, 0)).astype(np.uint8)       #   blue if inflow
-        img[:, :] = np.stack((r, g, b), axis=-1)
-    
-    def get_pressure_field_img(self, img, smoke_only=False) -> None:
+        s = self.s if not initial else self.s0
+        apply_colourmap(s, 0, 1, colourmaps.get("grey", invert=settings.theme_name == "light"), img)
+    
+    def get_divergence_field_img(self, img:np.ndarray, colourmap:str="diverging") -> None:
+        """red if outflow, blue if inflow"""
+        apply_colourmap(self.derived.divergence, -5, 5, colourmaps.get(colourmap), img)
+    
+    def get_pressure_field_img(self, img, smoke_only=False, colourmap:str="jet") -> None:
 
-        p = self.p.T
         max_p = 4_000 * self.density
-        np.clip(p, -max_p, max_p, out=p)
-        norm = 0.5 * (p / max_p) + 0.5
-                
-        #   jet colourmap (rainbow gradient)
-        r = np.where(norm < 0.5, 0, np.where(norm < 0.75, (255 * 4 * (norm - 0.5)), 255))
-        g = np.where(norm < 0.25, (255 * 4 * norm), np.where(norm < 0.75, 255, (255 * 4 * (1 - norm))))
-        b = np.where(norm < 0.25, 255, np.where(norm < 0.5, (255 * 4 * (0.5 - norm)), 0))
-        weight = np.clip(1.5 * self.s, 0, 1).T if smoke_only else np.ones_like(p)
-        img[:, :] = np.stack((r, g, b) * weight, axis=-1).astype(np.uint8)
+        if smoke_only:
+            apply_weighted_colourmap(self.p, -max_p, max_p, colourmaps.get(colourmap), self.s, 1.5, img)
+        else:
+            apply_colourmap(self.p, -max_p, max_p, colourmaps.get(colourmap), img)
 
-    def get_velocity_field_img(self, img:np.ndarray, initial=False) -> None:
-        
-        u = self.u.copy() if not initial else self.u0.copy()
-        v = self.v.copy() if not initial else self.v0.copy()
-        
-        cu = 0.5 * (u[:, :-1] + u[:, 1:])
-        cv = 0.5 * (v[:-1, :] + v[1:, :])
+    def get_lic_field_img(self, img:np.ndarray, stride:int=1, every:int=1) -> None:
+        """
+        streaks along the flow coloured by speed, brighter where the streaks are.\n
+        :param stride: multiplies the samples' spacing, fewer samples for lower cost
+        :param every: recompute the streaks every n-th call only, the colours follow the speed every call
+        """
+        if self.lic is None:
+            samples = -(-self.num_cells // self.lic_stride)
+            self.lic_noise = np.random.default_rng(0).random((samples, samples))
+            self.lic = np.zeros(self.COLLOCATED_GRID, dtype=np.float64)
+        if self.lic_calls % every == 0:
+            line_integral_convolution(self.u, self.v, self.w, self.lic_noise, self.lic_stride * stride, LIC_LENGTH, self.lic)
+        self.lic_calls += 1
+        apply_weighted_colourmap(self.derived.speed, 0, max(self.derived.max_speed, 1e-6), colourmaps.get("viridis"), self.lic, 1.0, img)
 
-        nu, nv = self.shrink_field(cu).T, self.shrink_field(cv).T
-        factor = cu.shape[0] / nu.shape[0]
-        vel = np.stack((-nv, nu)) / self.cell_size * self.cell_px  #  negate v for screen coordinates
-        
-        mag = np.zeros_like(nu)
-        mag[1:-1, 1:-1] = np.sqrt(np.sum(vel[:, 1:-1, 1:-1] ** 2, axis=0))
-        mag_clipped = np.clip(mag, 0, self.cell_px * 1.25 * factor)
-        
-        is_mag = mag > 0
-        d = np.zeros_like(vel)
-        d[:, is_mag] = vel[:, is_mag] / mag[is_mag]     #   get direction vector where mag > 0
-        
-        #   draw velocity lines
-        steps = np.linspace(0, 1, 20)
-        position = np.array((self.shrink_field(self.pos[0]), self.shrink_field(self.pos[1])))
-        for step in steps:
-            pos = (position[:, is_mag] + mag_clipped[is_mag] * d[:, is_mag] * step).astype(int)
-            valid = (0 < pos[0]) & (pos[0] < self.dim[0]) & (0 < pos[1]) & (pos[1] < self.dim[1])
-            colour = (0, 150, 255) if step < 0.7 else (0, 191, 255)
-            img[pos[1][valid], pos[0][valid]] = colour
\ No newline at end of file
+    def get_velocity_field_img(self, img:np.ndarray, initial=False, cell_px:float=None) -> None:
+        """
+        draws velocity arrows into img, indexed (x, y) like the overlay surface.\n
+        :param cell_px: pixels per cell in img, defaults to the displayed size
+        """
+        cell_px = cell_px or self.cell_px
+        u = self.u if not initial else self.u0
+        v = self.v if not initial else self.v0
+        block_px = self.arrow_px * cell_px / self.cell_px
+        resample_velocity(u, v, self.arrow_u, self.arrow_v)
+        draw_velocity_arrows(self.arrow_u, self.arrow_v, block_px, cell_px / self.cell_size, 1.25 * block_px, self.arrow_lut, img)
@@ -0,0 +1,116 @@
+"""
+run a saved project without a window, as fast as the kernels allow.\n
+usage: python -m cfd.simulation.headless <project> [--seconds 60 | --steps 3600] [--every 600] [--output snapshots] [--record video]\n
+project is a project name in the saves folder or the path to a project directory. snapshots of u, v, s and p are
+written to the output directory every few steps and after the last step. with --record, an image of the chosen field
+is recorded every few steps, one pixel per cell or shrunk to at most --record-size pixels across
+"""
+import numpy as np
+
+import os
+import sys
+import math
+import logging
+import argparse
+from time import perf_counter
+
+import cfd.helpers.logger as log
+from cfd.settings.manager import settings
+from cfd.helpers import threads
+from cfd.helpers.recorder import FORMATS, VideoRecorder
+from cfd.helpers.files import SAVES_PATH, Project, load_json
+from cfd.simulation.grid import Grid
+from cfd.simulation.resample import resample_image, resampled_side
+
+logger = logging.getLogger(__name__)
+
+
+def open_project(name:str) -> Project | None:
+    """finds project by directory path or by name in the saves folder"""
+
+    path = name if os.path.isdir(name) else os.path.join(SAVES_PATH, name)
+    options = load_json(os.path.join(path, "options.json")) if os.path.isdir(path) else None
+    if not options:
+        logger.error(f"No project found at /{path}")
+        return None
+    return Project(os.path.basename(os.path.normpath(path)), path, options, load_json(os.path.join(path, "metadata.json")) or {})
+
+def save_snapshot(output:str, grid:Grid, step:int) -> None:
+
+    filepath = os.path.join(output, f"step_{step:07d}.npz")
+    try:
+        np.savez_compressed(filepath, u=grid.u, v=grid.v, s=grid.s, p=grid.p, w=grid.w, time=step * grid.dt)
+        logger.info(f"Saved snapshot at t = {step * grid.dt:.2f}s to /{filepath}")
+    except PermissionError as e:
+        logger.error(f"Cannot write to file, please enable permision to write files ({e})")
+
+
+def render_field(grid:Grid, field:str, img:np.ndarray) -> None:
+    """draws field and walls into img, indexed (x, y) like pygame surfaces"""
+
+    match field:
+        case "smoke": grid.get_smoke_field_img(img)
+        case "pressure": grid.get_pressure_field_img(img)
+        case "divergence": grid.get_divergence_field_img(img)
+        case "lic": grid.get_lic_field_img(img)
+    grid.get_walls_field_img(img)
+
+
+def run(project:Project, steps:int, iter:int, sor_weight:float, every:int=0, output:str=None, record:str=None, record_every:int=1, fmt:str="auto", field:str="smoke", size:int=0) -> Grid:
+
+    grid = Grid(project)
+    every = every or steps
+    if output: os.makedirs(output, exist_ok=True)
+    recorder = VideoRecorder(record, fmt, fps=settings.fps / record_every) if record else None
+    img = np.zeros((grid.num_cells, grid.num_cells, 3), dtype=np.uint8)
+    side = resampled_side(grid.num_cells, size)
+    frame = img if side == grid.num_cells else np.zeros((side, side, 3), dtype=np.uint8)
+
+    def callback(grid:Grid, step:int) -> None:
+        if output and (step % every == 0 or step == steps): save_snapshot(output, grid, step)
+        if recorder and step % record_every == 0:
+            render_field(grid, field, img)
+            if frame is not img: resample_image(img, frame)
+            recorder.push(frame, block=True)      #   nothing is waiting on a headless run, so frames are never dropped
+
+    #   grid returns to python at every snapshot and every recorded frame
+    intervals = [every] * bool(output) + [record_every] * bool(recorder)
+    logger.info(f"Advancing {project.name} by {steps} steps ({steps * grid.dt:.2f}s)...")
+    start = perf_counter()
+    grid.advance(steps, iter, sor_weight, callback if intervals else None, math.gcd(*intervals) if intervals else 0)
+    if recorder: recorder.stop()
+    elapsed = perf_counter() - start
+    logger.info(f"Finished {steps} steps in {elapsed:.2f}s ({steps / elapsed:.1f} steps/s, {steps * grid.dt / elapsed:.2f}x real time)")
+    return grid
+
+def main() -> int:
+
+    parser = argparse.ArgumentParser(description="Run a saved project without a window")
+    parser.add_argument("project", help="project name or path to project directory")
+    duration = parser.add_mutually_exclusive_group(required=True)
+    duration.add_argument("--seconds", type=float, help="simulated time to advance")
+    duration.add_argument("--steps", type=int, help="number of steps to advance")
+    parser.add_argument("--every", type=int, default=0, help="save a snapshot every n steps, 0 - only after the last step")
+    parser.add_argument("--output", help="directory of snapshots, nothing is saved if omitted")
+    parser.add_argument("--record", help="directory of recorded frames, nothing is recorded if omitted")
+    parser.add_argument("--record-every", type=int, default=1, help="record a frame every n steps")
+    parser.add_argument("--format", choices=FORMATS, default="auto", help="recording format, auto - ffmpeg if installed, otherwise png")
+    parser.add_argument("--field", choices=["smoke", "pressure", "divergence", "lic"], default="smoke", help="field recorded")
+    parser.add_argument("--record-size", type=int, default=0, help="largest side of recorded frames in pixels, 0 - one pixel per cell")
+    parser.add_argument("--iter", type=int, help="Gauss-Seidel iterations, defaults to settings")
+    parser.add_argument("--sor-weight", type=float, help="over-relaxation weight, defaults to settings")
+    args = parser.parse_args()
+
+    log.init()
+    settings.load()
+    threads.configure()
+
+    project = open_project(args.project)
+    if project is None: return 1
+    steps = args.steps if args.steps is not None else round(args.seconds * settings.fps)
+    run(project, steps, args.iter or settings.iterator, args.sor_weight or settings.sor_weight, args.every, args.output, args.record, args.record_every, args.format, args.field, args.record_size)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
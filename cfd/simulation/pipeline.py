@@ -0,0 +1,58 @@
+import numpy as np
+from numba import njit
+
+from cfd.simulation.algorithms import *
+from cfd.simulation.emitters import apply_emitters
+
+#   ==========[ FUSED STEP ]==========
+@njit("void(float64[:, :])", cache=True, inline="always")
+def zero_border(arr:np.ndarray[np.float64]) -> None:
+    arr[0, :] = arr[-1, :] = 0
+    arr[:, 0] = arr[:, -1] = 0
+
+@njit("void(uint16, float32, float32, float32, float32, float64, uint8[:, :], float64[:, :], float64[:, :], float64[:, :], float64[:, :], float64[:, :], float64[:, :], float64[:, :], float64[:, :], int32[:], float64[:], int32[:], float64[:], int32[:], float64[:], uint16, float32, boolean, boolean, uint32, float64[:])", cache=True, fastmath=True)
+def fused_step(num_cells:int, dt:float, cell_size:float, cell_size_sq:float, density:float, gravity_dv:float, w:np.ndarray[np.uint8],
+               u:np.ndarray[np.float64], v:np.ndarray[np.float64], s:np.ndarray[np.float64], nu:np.ndarray[np.float64], nv:np.ndarray[np.float64], ns:np.ndarray[np.float64], div:np.ndarray[np.float64], p:np.ndarray[np.float64],
+               u_idx:np.ndarray[np.int32], u_val:np.ndarray[np.float64], v_idx:np.ndarray[np.int32], v_val:np.ndarray[np.float64], s_idx:np.ndarray[np.int32], s_val:np.ndarray[np.float64],
+               iter:int, sor_weight:float, project:bool, advect:bool, steps:int, mass:np.ndarray[np.float64]) -> None:
+    """
+    advance simulation by steps without returning to python in between, same stages as Grid.step_stages.\n
+    advection swaps between the field and its buffer instead of copying, fields are copied back once at the end.
+    smoke is only clipped once per step after sources are added, advection and projection keep it within [0, 1].
+    mass - row sums of smoke after the last step, see semi_lagrangian_advect_smoke
+    """
+    cu, cv, cs = u, v, s        #   current fields
+    bu, bv, bs = nu, nv, ns     #   advection targets
+    swapped = False
+    no_partials = np.empty((0, 5))
+    for _ in range(steps):
+        #   1. add external sources
+        apply_emitters(cu, cv, cs, gravity_dv, u_idx, u_val, v_idx, v_val, s_idx, s_val)
+        np.clip(cs, 0, 1, cs)
+        free_slip_wall_check(num_cells, w, cu, cv)
+
+        #   2. move smoke and velocity around, ghost cells are never advected into
+        if advect:
+            semi_lagrangian_advect_smoke(dt, cell_size, num_cells, w, cs, bs, cu, cv, mass)
+            semi_lagrangian_advect_velocity(dt, cell_size, num_cells, w, cu, cv, bu, bv)
+            zero_border(bs)
+            zero_border(bu)
+            zero_border(bv)
+            cu, bu = bu, cu
+            cv, bv = bv, cv
+            cs, bs = bs, cs
+            swapped = not swapped
+
+        #   3. clears out divergence to enforce incompressibility
+        get_divergence_field(num_cells, cell_size, w, cu, cv, div, no_partials)
+        p[:, :] = 0
+        for _ in range(iter):
+            pressure_sweep(dt, num_cells, cell_size_sq, density, w, div, p, sor_weight)
+        if project:
+            pressure_projection(dt, num_cells, cell_size, density, w, p, cu, cv)
+        free_slip_wall_check(num_cells, w, cu, cv)
+
+    if swapped:
+        u[:, :] = cu
+        v[:, :] = cv
+        s[:, :] = cs
@@ -0,0 +1,101 @@
+import numpy as np
+from numba import njit, prange
+
+ARROW_SLOW = (0, 150, 255)      #   colour of arrows at rest
+ARROW_FAST = (255, 60, 60)      #   colour of arrows at their longest
+ARROW_HEAD = 0.3                #   arrowhead length relative to arrow length
+
+
+#   ==========[ VELOCITY ARROWS ]==========
+@njit("void(uint8[:, :, :], float64, float64, float64, float64, uint8[:])", cache=True, inline="always")
+def draw_line(img:np.ndarray[np.uint8], x0:float, y0:float, x1:float, y1:float, colour:np.ndarray[np.uint8]) -> None:
+    """one pixel wide line, pixels outside image are skipped"""
+
+    n = int(max(abs(x1 - x0), abs(y1 - y0))) + 1
+    for k in range(n + 1):
+        x = int(x0 + (x1 - x0) * k / n)
+        y = int(y0 + (y1 - y0) * k / n)
+        if 0 <= x < img.shape[0] and 0 <= y < img.shape[1]:
+            img[x, y, 0] = colour[0]
+            img[x, y, 1] = colour[1]
+            img[x, y, 2] = colour[2]
+
+@njit("void(float64[:, :], float64[:, :], int64, float64, float64, float64, uint8[:, :], uint8[:, :, :])", cache=True, inline="always")
+def draw_arrow_row(cu:np.ndarray[np.float64], cv:np.ndarray[np.float64], bi:int, block_px:float, scale:float, max_len:float, lut:np.ndarray[np.uint8], img:np.ndarray[np.uint8]) -> None:
+    """arrows of block row bi, see draw_velocity_arrows"""
+
+    blocks = cu.shape[0]
+    for bj in range(1, blocks - 1):
+        dx, dy = cu[bi, bj] * scale, -cv[bi, bj] * scale      #   screen y points down
+        length = np.sqrt(dx * dx + dy * dy)
+        if length == 0: continue
+
+        colour = lut[int(min(length / max_len, 1.0) * (len(lut) - 1))]
+        k = min(length, max_len) / length
+        dx, dy = dx * k, dy * k
+        x0, y0 = (bj + 0.5) * block_px, (bi + 0.5) * block_px
+        x1, y1 = x0 + dx, y0 + dy
+        draw_line(img, x0, y0, x1, y1, colour)
+
+        #   arrowhead, two lines from tip rotated 30 degrees either side of backwards
+        hx, hy = -ARROW_HEAD * dx, -ARROW_HEAD * dy
+        if hx * hx + hy * hy < 4: continue
+        c, s = 0.8660254, 0.5
+        draw_line(img, x1, y1, x1 + c * hx - s * hy, y1 + s * hx + c * hy, colour)
+        draw_line(img, x1, y1, x1 + c * hx + s * hy, y1 - s * hx + c * hy, colour)
+
+@njit("void(float64[:, :], float64[:, :], float64, float64, float64, uint8[:, :], uint8[:, :, :])", cache=True, parallel=True, fastmath=True)
+def draw_velocity_arrows(cu:np.ndarray[np.float64], cv:np.ndarray[np.float64], block_px:float, scale:float, max_len:float, lut:np.ndarray[np.uint8], img:np.ndarray[np.uint8]) -> None:
+    """
+    draws an arrow for every block of cells, pointing along the block's mean velocity.\n
+    img is indexed (x, y) like pygame surfaces, block row bi is drawn at y and column bj at x.
+    :param cu, cv: mean cell centred velocity of every block, e.g. from resample_velocity
+    :param block_px: side of a block in pixels
+    :param scale: pixels per unit of velocity
+    :param max_len: longest arrow in pixels, arrows are coloured by their length along lut
+    """
+    blocks = cu.shape[0]
+
+    #   arrows reach max_len from their block's centre, rows drawn at the same time are further apart than two arrows so
+    #   no two threads write the same pixel
+    passes = int((2 * max_len + 2) / block_px) + 1
+    for first in range(1, 1 + passes):      #   no arrows along the border
+        for n in prange(max(0, -(-(blocks - 1 - first) // passes))):
+            bi = first + n * passes
+            draw_arrow_row(cu, cv, bi, block_px, scale, max_len, lut, img)
+
+#   ==========[ LINE INTEGRAL CONVOLUTION ]==========
+@njit("void(float64[:, :], float64[:, :], uint8[:, :], float64[:, :], uint16, uint16, float64[:, :])", cache=True, parallel=True, fastmath=True)
+def line_integral_convolution(u:np.ndarray[np.float64], v:np.ndarray[np.float64], w:np.ndarray[np.uint8], noise:np.ndarray[np.float64], stride:int, length:int, out:np.ndarray[np.float64]) -> None:
+    """
+    averages noise along the streamline through the centre of every stride x stride block of cells, so the noise is
+    smeared into streaks following the flow. streamlines are traced length steps of half a block both ways and stop at
+    walls, noise is one value per block. every cell of a block gets the block's value, contrast is stretched so out
+    is spread around 0.5 however many samples were averaged.\n
+    cost is proportional to (num_cells / stride)^2 * length
+    """
+    n = out.shape[0]
+    blocks = -(-n // stride)
+    for bi in prange(blocks):
+        for bj in range(blocks):
+            total = noise[bi, bj]
+            count = 1
+            for direction in (-1.0, 1.0):
+                y = min((bi + 0.5) * stride, n - 0.5)
+                x = min((bj + 0.5) * stride, n - 0.5)
+                for _ in range(length):
+                    i, j = int(y), int(x)
+                    if w[i, j] == 0: break
+                    cu = 0.5 * (u[i, j] + u[i, j+1])
+                    cv = -0.5 * (v[i, j] + v[i+1, j])       #   row index increases downwards
+                    speed = np.sqrt(cu * cu + cv * cv)
+                    if speed == 0: break
+                    k = direction * 0.5 * stride / speed
+                    x += cu * k
+                    y += cv * k
+                    if not (0 <= y < n and 0 <= x < n): break
+                    total += noise[int(y) // stride, int(x) // stride]
+                    count += 1
+
+            value = min(max(0.5 + (total / count - 0.5) * 0.2 * np.sqrt(12 * count), 0.0), 1.0)     #   mean of count uniform samples has deviation 1 / sqrt(12 count)
+            out[bi * stride:(bi + 1) * stride, bj * stride:(bj + 1) * stride] = value
@@ -0,0 +1,69 @@
+"""
+area resampling, every output cell is the mean of the input cells it covers weighted by how much of each it covers.
+factors can be any size and need not divide the input, so odd sizes and fractional factors lose no cells.
+every kernel is a single pass over the output, touching each input cell about once
+"""
+import numpy as np
+from numba import njit, prange
+
+
+#   ==========[ HELPERS ]==========
+@njit("UniTuple(float64, 2)(int64, float64, int64)", cache=True, inline="always")
+def span(k:int, factor:float, size:int) -> tuple[float, float]:
+    """interval of input cells covered by output cell k"""
+    return k * factor, min((k + 1) * factor, size)
+
+@njit("float64(int64, float64, float64)", cache=True, inline="always")
+def overlap(i:int, start:float, stop:float) -> float:
+    """length of input cell i inside [start, stop)"""
+    return min(i + 1, stop) - max(i, start)
+
+def resampled_side(side:int, limit:int) -> int:
+    """side shrunk to at most limit, never enlarged, unchanged if limit is 0"""
+    return min(side, limit) if limit > 0 else side
+
+
+#   ==========[ KERNELS ]==========
+@njit("void(float64[:, :], float64[:, :], float64[:, :], float64[:, :])", cache=True, parallel=True, fastmath=True)
+def resample_velocity(u:np.ndarray[np.float64], v:np.ndarray[np.float64], cu:np.ndarray[np.float64], cv:np.ndarray[np.float64]) -> None:
+    """resamples staggered u (n, n+1) and v (n+1, n) to cell centred velocities of the shape of cu and cv"""
+
+    rows, cols = u.shape[0], v.shape[1]
+    fy, fx = rows / cu.shape[0], cols / cu.shape[1]
+    for oi in prange(cu.shape[0]):
+        y0, y1 = span(oi, fy, rows)
+        for oj in range(cu.shape[1]):
+            x0, x1 = span(oj, fx, cols)
+            tu = tv = 0.0
+            for i in range(int(y0), int(np.ceil(y1))):
+                wy = overlap(i, y0, y1)
+                for j in range(int(x0), int(np.ceil(x1))):
+                    a = wy * overlap(j, x0, x1)
+                    tu += a * (u[i, j] + u[i, j+1])
+                    tv += a * (v[i, j] + v[i+1, j])
+            area = 2 * (y1 - y0) * (x1 - x0)
+            cu[oi, oj] = tu / area
+            cv[oi, oj] = tv / area
+
+@njit("void(uint8[:, :, :], uint8[:, :, :])", cache=True, parallel=True, fastmath=True)
+def resample_image(img:np.ndarray[np.uint8], out:np.ndarray[np.uint8]) -> None:
+    """resamples (x, y, 3) image to the size of out, colours are averaged per channel"""
+
+    width, height = img.shape[0], img.shape[1]
+    fx, fy = width / out.shape[0], height / out.shape[1]
+    for ox in prange(out.shape[0]):
+        x0, x1 = span(ox, fx, width)
+        for oy in range(out.shape[1]):
+            y0, y1 = span(oy, fy, height)
+            r = g = b = 0.0
+            for x in range(int(x0), int(np.ceil(x1))):
+                wx = overlap(x, x0, x1)
+                for y in range(int(y0), int(np.ceil(y1))):
+                    a = wx * overlap(y, y0, y1)
+                    r += a * img[x, y, 0]
+                    g += a * img[x, y, 1]
+                    b += a * img[x, y, 2]
+            area = (x1 - x0) * (y1 - y0)
+            out[ox, oy, 0] = np.uint8(r / area + 0.5)
+            out[ox, oy, 1] = np.uint8(g / area + 0.5)
+            out[ox, oy, 2] = np.uint8(b / area + 0.5)
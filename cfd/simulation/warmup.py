@@ -0,0 +1,55 @@
+import logging
+import threading
+from time import perf_counter
+from importlib import import_module
+
+logger = logging.getLogger(__name__)
+
+#   modules holding eagerly compiled numba kernels, compiled (or loaded from cache) when imported
+KERNEL_MODULES = ("cfd.simulation.algorithms", "cfd.simulation.emitters", "cfd.simulation.pipeline", "cfd.simulation.render", "cfd.simulation.resample", "cfd.simulation.colourmaps", "cfd.simulation.derived")
+
+timings: dict[str, float] = {}
+_ready = threading.Event()
+_thread: threading.Thread = None
+
+
+def _load() -> None:
+
+    start = perf_counter()
+    for name in KERNEL_MODULES:
+        t = perf_counter()
+        try:
+            import_module(name)
+        except Exception as e:
+            logger.critical(f"An error has occured when compiling {name} ({e})")
+        timings[name] = perf_counter() - t
+        logger.debug(f"Loaded kernels from {name} in {timings[name]:.2f}s")
+    timings["total"] = perf_counter() - start
+    logger.info(f"Finished compiling algorithms in {timings['total']:.2f}s")
+    _ready.set()
+
+def start() -> None:
+    """compile / load kernels on a background thread so screens stay interactive meanwhile"""
+
+    global _thread
+    if _thread is not None: return
+    
+    #   numba's thread pool must be launched from the main thread, interpreter hangs on exit otherwise
+    from numba import get_num_threads
+    get_num_threads()       #   launches the pool if it is not running yet
+    
+    logger.info("Compiling algorithms in background...")
+    _thread = threading.Thread(target=_load, name="kernel-warmup", daemon=True)
+    _thread.start()
+
+def wait() -> None:
+    """block until kernels are ready, compiles on the calling thread if warm-up was never started"""
+
+    if _ready.is_set(): return
+    if _thread is None:
+        _load()
+        return
+    logger.info("Waiting for algorithms to finish compiling...")
+    start = perf_counter()
+    _thread.join()
+    logger.info(f"Waited {perf_counter() - start:.2f}s for algorithms")